@@ -1,6 +1,21 @@
 # allow repo itself to be loaded as a package
 
-from .src.main import dashboard
 from .src.config import Config
 from .src.colors import Colors
 from .src.strings import Strings
+
+# `dashboard` and `render_dashboard` are loaded on first use, see src/__init__.py
+_LAZY = {"dashboard", "render_dashboard"}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        from . import src
+
+        return getattr(src, name)
+    error_msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error_msg)
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY])
@@ -0,0 +1,72 @@
+# Benchmark of date parsing on a synthetic ledger
+#
+# Run from the repo root with:
+#     python -m benchmarks.bench_dates [nrows]
+
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import src as nwd
+from src.main import dates_to_days, dates_to_years, parse_dates
+
+NROWS = 1_000_000
+
+
+def write_csv(fname, nrows):
+    dates = pd.date_range("1990-01-01", periods=nrows, freq="h").strftime("%Y-%m-%d")
+    with open(fname, "w") as f:
+        f.write(",Cash\n")
+        f.write("Date,Daily\n")
+    pd.DataFrame({"Date": dates, "Daily": np.arange(nrows)}).to_csv(fname, mode="a", header=False, index=False)
+
+
+def strptime_loop(config, data):
+    """The previous two-pass implementation, kept here as the reference."""
+    datecol = config.strings.datecol
+    years = data[datecol].apply(lambda x: datetime.strptime(x, config.datefmt).replace(tzinfo=timezone.utc).year)
+    sincedate = datetime(config.since_yr, 1, 1, tzinfo=timezone.utc)
+    days = np.empty(len(data[datecol]))
+    for ii, ent in enumerate(data[datecol]):
+        y = datetime.strptime(ent, config.datefmt).replace(tzinfo=timezone.utc)
+        days[ii] = (y - sincedate).days / 365
+    return years, days
+
+
+def vectorised(config, data):
+    data = data.copy()
+    data[config.strings.datecol] = parse_dates(config, data)
+    years = dates_to_years(config, data)
+    days = dates_to_days(config, data)
+    return years, days
+
+
+def main(nrows=NROWS):
+    config = nwd.Config(born_yr=1981, datefmt="%Y-%m-%d", since_yr=1990)
+    config.errors = {}
+
+    with tempfile.NamedTemporaryFile(suffix=".csv") as tmp:
+        write_csv(tmp.name, nrows)
+        data = pd.read_csv(tmp.name, header=1)
+
+    t0 = time.perf_counter()
+    years_ref, days_ref = strptime_loop(config, data)
+    t1 = time.perf_counter()
+    years_new, days_new = vectorised(config, data)
+    t2 = time.perf_counter()
+
+    assert (years_ref.to_numpy() == years_new.to_numpy()).all()
+    assert np.allclose(days_ref, days_new)
+
+    print(f"rows:       {nrows}")  # noqa: T201
+    print(f"strptime:   {t1 - t0:.3f} s")  # noqa: T201
+    print(f"vectorised: {t2 - t1:.3f} s")  # noqa: T201
+    print(f"speedup:    {(t1 - t0) / (t2 - t1):.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NROWS)
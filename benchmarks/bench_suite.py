@@ -0,0 +1,175 @@
+# Benchmark suite of ingest, aggregation and each layout on synthetic ledgers
+#
+# Run from the repo root with:
+#     python -m benchmarks.bench_suite [--rows 1000 10000 ...] [--out results.json]
+#
+# Results are written as JSON so that runs can be compared between commits.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+import src as nwd
+from src import main as nwd_main
+
+from .ledger import NCOLS, SHARE_FOCUS, synthetic_ledger
+
+ROWS = [1_000, 10_000, 100_000, 1_000_000]
+EXPR_FREQS = [0.0, 0.05, 0.5]
+# the number of columns of each category is scaled by these factors
+COL_SCALES = [1, 4]
+# layouts are slow to create for large ledgers, so are only timed up to this many rows
+LAYOUT_MAX_ROWS = 100_000
+
+
+class Timer(dict):
+    """Dict of seconds keyed by stage name, filled by `with timer("name"):`."""
+
+    def __call__(self, name):
+        return _Span(self, name)
+
+
+class _Span:
+    def __init__(self, timer, name):
+        self.timer, self.name = timer, name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.timer[self.name] = time.perf_counter() - self.start
+
+
+def run_case(fname, layouts=True):
+    """
+    Time each stage of the dashboard for the ledger `fname`.
+
+    Returns
+    -------
+    seconds : dict
+        Seconds of each stage, keyed by stage name.
+    errors : dict
+        The error of each layout that failed (and so is missing from `seconds`).
+    """
+    timer = Timer()
+    errors = {}
+    csvdir, csv = os.path.split(fname)
+    config = nwd.Config(csvdir=csvdir + "/", csv=csv, born_yr=1981, datefmt="%Y-%m-%d", headless=True)
+    config.share_focus = SHARE_FOCUS
+    nwd_main.prepare_config(config)
+
+    with timer("read_headers"):
+        nwd_main.read_headers(config)
+    with timer("read_ledger"):
+        config, raw = nwd_main.read_ledger(config)
+
+    raw[config.strings.datecol] = nwd_main.parse_dates(config, raw)
+    raw["Year"] = nwd_main.dates_to_years(config, raw)
+    with timer("expr_expend_columns"):
+        nwd_main.expr_expend_columns(raw, config.expend_cols)
+    with timer("expr_columns"):
+        nwd_main.expr_columns(raw, config.cash_cols + config.income_cols)
+
+    with timer("build_ledger"):
+        alldata = nwd_main.build_ledger(config)
+    with timer("dates_to_days"):
+        nwd_main.dates_to_days(config, alldata)
+
+    nwd_main.derive_config(config, alldata)
+    with timer("year_summary"):
+        nwd_main.year_summary(config, alldata)
+    # the builders below share the per-year summary timed above
+    with timer("sankey_makeup"):
+        nwd_main.sankey_makeup(config, alldata, ["totalShares", "totalSuper", "totalCash"], "last")
+    with timer("sankey_income"):
+        nwd_main.sankey_income(config, alldata, config.income_cols)
+    with timer("sankey_shares"):
+        nwd_main.sankey_shares(config, alldata)
+
+    if layouts:
+        for name, create in nwd_main.LAYOUTS.items():
+            try:
+                with timer(f"create_dashboard:{name}"):
+                    fig = create(config, alldata)
+                with timer(f"draw:{name}"):
+                    fig.canvas.draw()
+                plt.close(fig)
+            except Exception as err:  # noqa: BLE001
+                timer.pop(f"create_dashboard:{name}", None)
+                timer.pop(f"draw:{name}", None)
+                errors[name] = f"{type(err).__name__}: {err}"
+
+    return dict(timer), errors
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_suite(rows=ROWS, expr_freqs=EXPR_FREQS, col_scales=COL_SCALES, layout_max_rows=LAYOUT_MAX_ROWS):
+    """
+    Run every combination of ledger size, expression frequency and column count.
+
+    The layouts are created and drawn only for ledgers of up to `layout_max_rows` rows.
+
+    Returns
+    -------
+    dict
+        `meta` describing the run and a list of `results`, one per case.
+    """
+    plt.switch_backend("Agg")
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fname = os.path.join(tmpdir, "ledger.csv")
+        for nrows in rows:
+            for scale in col_scales:
+                ncols = {cat: num * scale for cat, num in NCOLS.items()}
+                for freq in expr_freqs:
+                    synthetic_ledger(fname, nrows, ncols=ncols, expr_freq=freq)
+                    timings, errors = run_case(fname, layouts=nrows <= layout_max_rows)
+                    results.append({"rows": nrows, "ncols": ncols, "expr_freq": freq, "seconds": timings, "errors": errors})
+                    print(f"rows {nrows:>8}  cols x{scale}  expr {freq:.2f}  ingest {timings['build_ledger']:.3f}s")  # noqa: T201
+
+    meta = {
+        "commit": _commit(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": mpl.__version__,
+        "machine": platform.machine(),
+    }
+    return {"meta": meta, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark networthdash on synthetic ledgers.")
+    parser.add_argument("--rows", type=int, nargs="+", default=ROWS)
+    parser.add_argument("--expr-freq", type=float, nargs="+", default=EXPR_FREQS)
+    parser.add_argument("--col-scale", type=int, nargs="+", default=COL_SCALES)
+    parser.add_argument("--layout-max-rows", type=int, default=LAYOUT_MAX_ROWS, help="largest ledger to time the layouts for")
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.rows, args.expr_freq, args.col_scale, args.layout_max_rows)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"written to {args.out}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Synthetic ledgers for the benchmarks
+#
+# Write a CSV with e.g.:
+#     python -m benchmarks.ledger out.csv [nrows]
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+# columns per category of the synthetic ledger, in the order they are written
+NCOLS = {"Super": 2, "Shares": 3, "Cash": 2, "Expend": 2, "Income": 3}
+# the purchases of the first Expend column are of the funds named in a
+# "Fund" column, which the share4 layout selects from with this focus
+SHARE_FOCUS = {"expend_col": "Expend1", "fund": "Shares1"}
+
+
+def synthetic_ledger(fname, nrows, ncols=None, expr_freq=0.05, start="2016-01-01", end="2025-12-31", seed=0):
+    """
+    Write a ledger CSV (with the two-row header) of `nrows` entries.
+
+    Parameters
+    ----------
+    fname : str or path
+    nrows : int
+        Number of entries, spread evenly (in date order) between `start` and `end`.
+    ncols : dict
+        Number of columns for each category, defaults to `NCOLS`.
+    expr_freq : float
+        Fraction of the Cash and Income cells written as expressions such as
+        "20 x 4 + 10", and of the Expend cells written as "count x price".
+        The fund bought by each "Expend1" entry is written in a "Fund" column
+        (see `SHARE_FOCUS`).
+    seed : int
+        Seed of the random generator, so that ledgers are reproducible.
+    """
+    ncols = NCOLS if ncols is None else ncols
+    rng = np.random.default_rng(seed)
+
+    t0, t1 = np.datetime64(start, "D"), np.datetime64(end, "D")
+    dates = t0 + np.linspace(0, (t1 - t0).astype(int), nrows).astype(int)
+
+    frac = np.linspace(0, 1, nrows)
+    data = {"Date": np.datetime_as_string(dates, unit="D")}
+    cats = [""]
+
+    for cat, num in ncols.items():
+        for ii in range(num):
+            name = f"{cat}{ii + 1}"
+            cats.append(cat)
+            if cat in ("Super", "Shares"):
+                # growing balances with some noise
+                base = rng.uniform(1e4, 1e5)
+                vals = base * np.exp(2 * frac) * rng.normal(1, 0.02, nrows)
+                data[name] = np.round(vals).astype(np.int64)
+            elif cat == "Cash":
+                data[name] = _with_exprs(rng, rng.integers(1000, 50000, nrows), expr_freq, "sum")
+            elif cat == "Expend":
+                data[name] = _with_exprs(rng, np.full(nrows, 0), expr_freq, "count")
+            else:
+                vals = rng.integers(10, 10000, nrows).astype(object)
+                vals[rng.random(nrows) < 0.3] = ""
+                data[name] = _with_exprs(rng, vals, expr_freq, "sum")
+
+    if ncols.get("Expend") and ncols.get("Shares"):
+        cats.append(SHARE_FOCUS["expend_col"])
+        data["Fund"] = rng.choice([f"Shares{ii + 1}" for ii in range(ncols["Shares"])], nrows)
+
+    with open(fname, "w") as f:
+        f.write(",".join(cats) + "\n")
+        f.write(",".join(data) + "\n")
+    pd.DataFrame(data).to_csv(fname, mode="a", header=False, index=False)
+
+
+def _with_exprs(rng, vals, freq, kind):
+    """Replace a fraction `freq` of `vals` with expression strings."""
+    vals = np.asarray(vals, dtype=object)
+    ind = np.flatnonzero(rng.random(len(vals)) < freq)
+    count = rng.integers(1, 100, len(ind))
+    price = rng.integers(1, 500, len(ind))
+    if kind == "count":
+        exprs = [f"{cc} x {pp}" for cc, pp in zip(count, price)]
+    else:
+        extra = rng.integers(0, 1000, len(ind))
+        exprs = [f"{cc} x {pp} + {ee}" for cc, pp, ee in zip(count, price, extra)]
+    vals[ind] = exprs
+    return vals
+
+
+if __name__ == "__main__":
+    synthetic_ledger(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 10_000)
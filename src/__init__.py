@@ -1,7 +1,26 @@
 # allow repo itself to be loaded as a package
 
-from .main import dashboard
 from .config import Config
 from .colors import Colors
 from .strings import Strings
 
+# `main` imports matplotlib, pandas, numpy and ausankey, so it is only
+# loaded when one of its functions is first used (PEP 562)
+_LAZY = {"dashboard": "main", "render_dashboard": "main"}
+# the submodule itself, e.g. `src.main.load_ledger`, is loaded the same way
+_SUBMODULES = {"main"}
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    if name in _LAZY:
+        return getattr(import_module("." + _LAZY[name], __name__), name)
+    if name in _SUBMODULES:
+        return import_module("." + name, __name__)
+    error_msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(error_msg)
+
+
+def __dir__():
+    return sorted([*globals(), *_LAZY, *_SUBMODULES])
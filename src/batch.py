@@ -0,0 +1,177 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import matplotlib.pyplot as plt
+
+from . import cache
+from .config import Config
+from .main import dashboard, load_ledger, prepare_config
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one dashboard in a batch.
+
+    Parameters
+    ----------
+    config : Config
+        The config as passed to `batch()`.
+    seconds : float
+        Wall time for this dashboard, including reading the CSV if it was
+        the first dashboard for that file.
+    ingest_seconds : float
+        Time spent reading and processing the CSV for this dashboard
+        (zero when the ledger was shared with an earlier dashboard).
+    error : str
+        Traceback of the failure, or None if successful.
+    """
+
+    config: Config
+    seconds: float = 0.0
+    ingest_seconds: float = 0.0
+    error: str = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def configs_from_glob(pattern, anon=(False, True), **kwargs):
+    """
+    Create one Config per CSV file matching `pattern` for each value of `anon`.
+
+    Remaining keyword arguments are passed through to Config (`csv`, `csvdir`
+    and `anon` are overridden).
+    """
+    configs = []
+    for path in sorted(glob.glob(pattern)):
+        csvdir, csv = os.path.split(path)
+        for aa in anon:
+            configs.append(Config(**kwargs | {"csv": csv, "csvdir": (csvdir or ".") + "/", "anon": aa}))
+    return configs
+
+
+def _ingest_group(config):
+    return json.dumps(cache.cache_key(config), sort_keys=True)
+
+
+def batch(configs, workers=1):
+    """
+    Create the dashboards for a list of configs, continuing past failures.
+
+    Configs which read the same CSV file with the same settings share a single
+    ingest of the ledger. Each such group is run as one job, and with
+    `workers > 1` the jobs are spread over that many processes (using the Agg
+    backend).
+
+    Returns
+    -------
+    list[BatchResult]
+        One result per config, in the order given.
+    """
+    groups = {}
+    for ii, config in enumerate(configs):
+        groups.setdefault(_ingest_group(config), []).append(ii)
+    jobs = [[configs[ii] for ii in ind] for ind in groups.values()]
+
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=plt.switch_backend,
+            initargs=("Agg",),
+        ) as pool:
+            outcomes = list(pool.map(_run_job, jobs))
+    else:
+        outcomes = [_run_job(job) for job in jobs]
+
+    results = [None] * len(configs)
+    for ind, outcome in zip(groups.values(), outcomes):
+        for ii, (seconds, ingest_seconds, error) in zip(ind, outcome):
+            results[ii] = BatchResult(configs[ii], seconds, ingest_seconds, error)
+    return results
+
+
+def _run_job(configs):
+    """Create the dashboards for configs sharing a CSV file, returning (seconds, ingest_seconds, error) for each."""
+    outcome = []
+    alldata = None
+    for config in configs:
+        start = time.perf_counter()
+        ingest_seconds = 0.0
+        error = None
+        try:
+            prepare_config(config)
+            if alldata is None:
+                alldata = load_ledger(config)
+                ingest_seconds = time.perf_counter() - start
+            dashboard(config, alldata)
+        except Exception:  # noqa: BLE001
+            error = traceback.format_exc()
+        outcome.append((time.perf_counter() - start, ingest_seconds, error))
+    return outcome
+
+
+def main(argv=None):
+    """
+    Command line interface for batch dashboards, e.g.:
+
+        python -m networthdash.src.batch "ledgers/*.csv" --born-yr 1981 --workers 4
+    """
+    parser = argparse.ArgumentParser(description="Create net worth dashboards for many CSV files.")
+    parser.add_argument("patterns", nargs="+", help="CSV files or glob patterns")
+    parser.add_argument("--born-yr", type=int, required=True)
+    parser.add_argument("--retire-age", type=int, default=Config.retire_age)
+    parser.add_argument("--datefmt", default=Config.datefmt)
+    parser.add_argument("--layout", action="append", help="may be given more than once (default: main7)")
+    parser.add_argument("--savedir", default=Config.savedir)
+    parser.add_argument("--pdf", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--png", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--jpg", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--anon", choices=["no", "yes", "both"], default="both")
+    parser.add_argument("--cache", action="store_true", help="use the on-disk ledger cache")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    anon = {"no": (False,), "yes": (True,), "both": (False, True)}[args.anon]
+    configs = []
+    for pattern in args.patterns:
+        configs.extend(
+            configs_from_glob(
+                pattern,
+                anon=anon,
+                born_yr=args.born_yr,
+                retire_age=args.retire_age,
+                datefmt=args.datefmt,
+                layout=args.layout or Config.layout,
+                savedir=args.savedir,
+                savepdf=args.pdf,
+                savepng=args.png,
+                savejpg=args.jpg,
+                cache=args.cache,
+                headless=True,
+            )
+        )
+
+    results = batch(configs, workers=args.workers)
+    for res in results:
+        status = "ok  " if res.ok else "FAIL"
+        anon_str = " (anon)" if res.config.anon else ""
+        print(f"{status} {res.seconds:7.2f}s  {res.config.csvdir}{res.config.csv}{anon_str}")  # noqa: T201
+        if not res.ok:
+            print(res.error, file=sys.stderr)  # noqa: T201
+
+    return 0 if all(res.ok for res in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
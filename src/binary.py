@@ -0,0 +1,112 @@
+import json
+import os
+
+import numpy as np
+
+MAGIC = b"NWDLEDGR"
+BINARY_VERSION = 1
+BINARY_SUFFIX = ".nwdl"
+# column blocks start on multiples of this many bytes
+ALIGN = 64
+
+
+def is_binary_ledger(path):
+    """Whether the file at `path` is a binary ledger (rather than a CSV file)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def write_binary_ledger(path, hdrrows, columns):
+    """
+    Write columns of equal length as a binary ledger.
+
+    The file is the `MAGIC` bytes, the length of the metadata as a
+    little-endian uint64, the metadata as JSON, and then each column as a
+    contiguous little-endian block starting on a multiple of `ALIGN` bytes.
+    The metadata holds the two header rows of the CSV file (`hdrrows`, as
+    from `read_headers()`), the number of rows, and the name, dtype and
+    offset of each column.
+
+    Parameters
+    ----------
+    path : str or path
+    hdrrows : tuple
+        The category row and the name row of the CSV header.
+    columns : dict
+        Arrays keyed by column name, e.g. float64 amounts, a datetime64 date
+        column and fixed-width unicode strings.
+    """
+    arrays = {name: np.asarray(vals) for name, vals in columns.items()}
+    arrays = {name: vals.astype(vals.dtype.newbyteorder("<")) for name, vals in arrays.items()}
+    nrows = len(next(iter(arrays.values()), []))
+    if any(len(vals) != nrows for vals in arrays.values()):
+        error_msg = "All columns of a binary ledger must have the same length."
+        raise ValueError(error_msg)
+
+    meta = {
+        "version": BINARY_VERSION,
+        "rows": nrows,
+        "hdrrows": [list(row) for row in hdrrows],
+        "columns": [],
+    }
+    # the offsets depend on the length of the metadata, which depends on the offsets
+    width = 0
+    while True:
+        offset = _align(len(MAGIC) + 8 + width)
+        meta["columns"] = []
+        for name, vals in arrays.items():
+            meta["columns"].append({"name": name, "dtype": vals.dtype.str, "offset": offset})
+            offset = _align(offset + vals.nbytes)
+        header = json.dumps(meta).encode()
+        if len(header) <= width:
+            break
+        width = len(header)
+    header = header.ljust(width)
+
+    tmp = str(path) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint64(width).astype("<u8").tobytes())
+        f.write(header)
+        for col, vals in zip(meta["columns"], arrays.values()):
+            f.write(b"\0" * (col["offset"] - f.tell()))
+            f.write(np.ascontiguousarray(vals).tobytes())
+    os.replace(tmp, path)
+
+
+def read_binary_ledger(path):
+    """
+    Memory-map the columns of a binary ledger, see `write_binary_ledger()`.
+
+    Returns
+    -------
+    meta : dict
+        The metadata, including the `hdrrows` of the CSV file.
+    columns : dict
+        Read-only `numpy.memmap` of each column, keyed by name. Nothing is
+        read from the file until the values are used.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            error_msg = f"'{path}' is not a binary ledger."
+            raise ValueError(error_msg)
+        width = int(np.frombuffer(f.read(8), dtype="<u8")[0])
+        meta = json.loads(f.read(width))
+    if meta["version"] != BINARY_VERSION:
+        error_msg = f"Binary ledger version {meta['version']} of '{path}' is not supported, convert the CSV file again."
+        raise ValueError(error_msg)
+
+    columns = {}
+    for col in meta["columns"]:
+        if meta["rows"] == 0:
+            columns[col["name"]] = np.empty(0, dtype=col["dtype"])
+        else:
+            columns[col["name"]] = np.memmap(path, dtype=col["dtype"], mode="r", offset=col["offset"], shape=(meta["rows"],))
+    return meta, columns
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
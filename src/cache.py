@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import time
+import zipfile
+from dataclasses import asdict
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 4
+CACHE_SUFFIX = ".nwdcache.npz"
+# files modified more recently than this (in ns) are always hashed
+RACY_NS = 2_000_000_000
+
+
+def cache_path(config):
+    """The cache file is stored next to the CSV file."""
+    return config.csvdir + config.csv + CACHE_SUFFIX
+
+
+def cache_key(config):
+    """
+    Identify the CSV file and the Config fields which affect the processed ledger.
+
+    The key must be computed before processing since `config.since_yr` is
+    filled in from the data if not specified. A ledger read in chunks only
+    keeps the columns the layouts read, which depend on the share focus.
+    """
+    chunked = bool(config.chunksize)
+    return {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(config.csvdir + config.csv),
+        "datefmt": config.datefmt,
+        "since_yr": None if config.since_yr is None else int(config.since_yr),
+        "strings": asdict(config.strings),
+        "chunked": chunked,
+        "share_focus": config.share_focus if chunked else None,
+    }
+
+
+def csv_stat(path):
+    """
+    Return the modification time (in ns) and size of the CSV file, or None if it was just modified.
+
+    A cache recording the same stat is used without hashing the file. An
+    edit within the timestamp resolution of the filesystem could leave both
+    unchanged, so the stat of a file modified in the last `RACY_NS` is not
+    recorded.
+    """
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns < RACY_NS:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def read_appended(path, size=0):
+    """
+    Read the CSV file after its first `size` bytes.
+
+    Returns
+    -------
+    prefix : str
+        SHA-256 of the first `size` bytes, to compare against the cached hash.
+    digest : str
+        SHA-256 of the whole file.
+    tail : bytes
+        The contents of the file after the first `size` bytes.
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        remaining = size
+        while remaining > 0:
+            chunk = f.read(min(1 << 20, remaining))
+            if not chunk:
+                break
+            sha.update(chunk)
+            remaining -= len(chunk)
+        prefix = sha.hexdigest()
+        tail = f.read()
+    sha.update(tail)
+    return prefix, sha.hexdigest(), tail
+
+
+def read_cache(config, key):
+    """Return `(alldata, meta)` from the cache, or None if missing or made with different settings."""
+    path = cache_path(config)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with np.load(path) as npz:
+            meta = json.loads(str(npz["meta"]))
+            if meta["key"] != key:
+                return None
+            data = {}
+            for ii, col in enumerate(meta["columns"]):
+                vals = npz[f"c{ii}"]
+                data[col] = vals.astype(object) if vals.dtype.kind == "U" else vals
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+    return pd.DataFrame(data), meta
+
+
+def write_cache(config, key, alldata, csv_state, extra):
+    """
+    Store the processed ledger as one array per column in an uncompressed `.npz` file.
+
+    `csv_state` records the size, hash, and final newline of the CSV bytes
+    that were processed so that appended rows can be detected next time, and
+    the `stat` of the file (see `csv_stat()`) so that an unchanged file need
+    not be hashed.
+    Non-numeric columns are stored as strings.
+    """
+    meta = {
+        "key": key,
+        "columns": list(alldata.columns),
+        "rows": len(alldata),
+        "extra": extra,
+    } | csv_state
+    arrays = {"meta": np.array(json.dumps(meta))}
+    for ii, col in enumerate(alldata.columns):
+        vals = alldata[col].to_numpy()
+        arrays[f"c{ii}"] = vals.astype(str) if vals.dtype == object else vals
+
+    path = cache_path(config)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
@@ -15,11 +15,11 @@ class Config:
         Names visual layout style. Accepts one or more of:
         {"main7","plain8"}
     csv : str
-        Filename of the CSV input file. Path information should not be included.
+        Filename of the CSV input file. Path information should not be included. May also be a binary ledger converted from the CSV file (see `convert_ledger()`), which is memory-mapped rather than parsed.
     csvdir : str
         Path to the CSV input file. Concatenated directly with the CSV filename, so should end in a "/".
     savedir : str
-        Path (ending in "/") to save PDF dashboards.
+        Path (ending in "/") to save PDF dashboards. Layouts other than "main7" have the layout name appended to the filename.
     saveprefix : str
         First part of filename to save. Defaults to the CSV filename stripped of its file extension.
     savesuffix : str
@@ -30,8 +30,22 @@ class Config:
         If true saves a JPG of the dashboard in the `savedir` folder.
     savepng : bool
         If true saves a PNG of the dashboard in the `savedir` folder.
+    headless : bool
+        If true, switches matplotlib to the non-interactive Agg backend and does not call `plt.show()`; use this when running without a display (e.g., in a server). The figures are returned by `dashboard()`.
+    reuse_figures : bool
+        If true (and `headless`), the figure and axes of each layout are kept and cleared for reuse by the next dashboard with the same layout, rather than rebuilt. A figure returned by `dashboard()` is then only valid until the next dashboard with that layout.
+    workers : int
+        Number of processes to use when several layouts are requested. With more than one, each layout is rendered in its own process (using the non-interactive Agg backend).
+    timing : bool
+        If true, `dashboard()` records the time taken by each of its stages (reading, processing, and creating and saving each layout) and by each panel. The report is stored in `config.timing_report` and logged at INFO level to the "networthdash" logger.
+    profile : bool or str
+        If true, `dashboard()` also runs under cProfile and the functions with the most cumulative time are added to the timing report. If a filename, the profile statistics are also saved there (for `pstats` or `snakeviz`).
     datefmt : str
         The date format used in the CSV file.
+    cache : bool
+        If true, the processed data is cached in a file next to the CSV file (with suffix `.nwdcache.npz`) and reused while the CSV file and the relevant settings are unchanged. If rows have only been appended to the CSV file, only the new rows are processed.
+    chunksize : int
+        If set, the CSV file is read and processed this many rows at a time, keeping only the processed columns of each chunk. This bounds the memory used while reading a large ledger to about the size of the processed ledger plus one chunk of raw text. Columns not in one of the categories are not kept, other than the "Fund" column of a share focus (for the share4 layout).
     since_yr : int
         Year to start the dashboard (default is the earliest year in the CSV file).
     until_yr : int
@@ -51,9 +65,11 @@ class Config:
     future_window : float
         The maximum number of extrapolation years to show on the graph.
     linear_targets: list[float]
-        "Targets" to extrapolate to linearly to gauge time until net worth milestones.
+        "Targets" to extrapolate to linearly to gauge time until net worth milestones. The years to each target are returned by `target_projection()`.
     anon : bool
         If True, hides all numerical labels.
+    share_focus : dict
+        Purchases of one fund shown by the "share4" layout: `{"expend_col": ..., "fund": ...}` names the Expend column of the purchases and the Shares column of the fund. The CSV file must then have a column whose category is that Expend column's name and whose name is "Fund", giving the fund of each purchase.
     colors : Colors
         Colors class setup for plot colours. See Colors class for defaults and options.
     strings : Strings
@@ -68,6 +84,10 @@ class Config:
         Marker of scatter plots.
     markersize : float
         Markersize of scatter plots.
+    decimate : str
+        Reduce the dense series of dots (the totals against time) to about two points per pixel column of their panel before plotting: `"minmax"` keeps the lowest and highest point of each pixel column, `"lttb"` picks points by largest-triangle-three-buckets. The default (`None`) plots every row.
+    rasterize_dots : int
+        Series of more dots than this are rasterized in vector (PDF) output, at the resolution of the figure (`dpi`), which keeps the file small and quick to open (e.g., 5000). The default (`None`) never rasterizes.
     node_width : float
         Relative width of Sankey diagram nodes (ausankey parameter).
     node_alpha : float
@@ -89,6 +109,8 @@ class Config:
     csv: str = "net-worth.csv"
     csvdir: str = "./"
     datefmt: str = "%Y/%m/%d"
+    cache: bool = False
+    chunksize: int = None
 
     savedir: str = "Net worth archive/"
     saveprefix: str = None
@@ -98,6 +120,13 @@ class Config:
     savejpg: bool = False
     savepng: bool = False
 
+    headless: bool = False
+    reuse_figures: bool = False
+    workers: int = 1
+
+    timing: bool = False
+    profile: bool = False
+
     since_yr: int = None
     until_yr: int = None
     retire_age: int = 67
@@ -109,6 +138,7 @@ class Config:
     future_window: int = 8
 
     anon: bool = False
+    share_focus: dict = None
 
     figw: float = 6
     figh: float = 12.5
@@ -116,6 +146,8 @@ class Config:
     linewidth: float = 1.0
     markersize: float = 4.0
     marker: str = "."
+    decimate: str = None
+    rasterize_dots: int = None
 
     colors: "Colors" = field(default_factory=Colors)
 
@@ -0,0 +1,37 @@
+import argparse
+import os
+import sys
+import time
+
+from .config import Config
+from .main import convert_ledger
+
+
+def main(argv=None):
+    """
+    Command line interface to convert CSV ledgers into binary ledgers, e.g.:
+
+        python -m networthdash.src.convert ledger.csv --datefmt %Y-%m-%d
+
+    writes `ledger.nwdl`, which can then be used as the `csv` of a Config.
+    """
+    parser = argparse.ArgumentParser(description="Convert net worth CSV files into memory-mappable binary ledgers.")
+    parser.add_argument("csv", nargs="+", help="CSV files to convert")
+    parser.add_argument("--datefmt", default=Config.datefmt)
+    parser.add_argument("-o", "--out", help="output file (only with a single CSV file; default: the CSV filename with extension .nwdl)")
+    args = parser.parse_args(argv)
+    if args.out and len(args.csv) > 1:
+        parser.error("--out can only be used with a single CSV file")
+
+    for path in args.csv:
+        csvdir, csv = os.path.split(path)
+        # the year of birth does not affect the ledger
+        config = Config(csvdir=(csvdir or ".") + "/", csv=csv, born_yr=0, datefmt=args.datefmt)
+        start = time.perf_counter()
+        dest = convert_ledger(config, args.out)
+        print(f"{time.perf_counter() - start:7.2f}s  {path} -> {dest}")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,85 @@
 import colorsys
+import copy
+import csv
+import io
+import multiprocessing
 import os
+import re
+import time
+import weakref
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import ausankey as sky
+import matplotlib as mpl
 import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from matplotlib.ticker import AutoMinorLocator
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.ticker import AutoMinorLocator, Formatter
+from PIL import Image
 
+from . import binary, cache
 from .config import Config
+from .timing import instrument, span, timed
 
 ####################
 
 
-def dashboard(config: Config):
+def dashboard(config: Config, alldata=None):
+    """
+    Create the dashboard layouts listed in `config.layout`.
+
+    `alldata` may be passed to reuse a ledger already built by `load_ledger()`
+    (or `build_ledger()`) for a config reading the same CSV file with the same
+    settings. The CSV header and `since_yr` are then taken from the ledger
+    (see `tag_ledger()`), so `config` need not have read the file itself.
+
+    Returns
+    -------
+    dict
+        The (closed) matplotlib Figure of each layout, keyed by layout name.
+    """
+    if config.headless:
+        plt.switch_backend("Agg")
+
+    with instrument(config):
+        with span(config, "prepare"):
+            prepare_config(config)
+
+        ############# DATA
+
+        if alldata is None:
+            with span(config, "ingest"):
+                alldata = load_ledger(config)
+        elif "hdrrows" in alldata.attrs:
+            _parse_headers(config, *alldata.attrs["hdrrows"])
+            config.since_yr = alldata.attrs["since_yr"]
+
+        with span(config, "derive"):
+            derive_config(config, alldata)
+
+        ########### CREATE FIGURE and AXES
+
+        if isinstance(config.layout, str):
+            config.layout = [config.layout]
+
+        layouts = [name for name in LAYOUTS if name in config.layout]
+        if config.workers > 1 and len(layouts) > 1:
+            with span(config, "render_parallel"):
+                return render_parallel(config, alldata, layouts)
+
+        return {name: render_layout(config, alldata, name) for name in layouts}
+
+
+def prepare_config(config):
+    """Set the internal plotting parameters and helpers on `config`."""
     # internal parameters
     # (possibly to generalise later)
 
@@ -28,6 +93,10 @@ def dashboard(config: Config):
     ############# HELPERS
 
     config.errors = {}
+    config.year_summaries = {}
+    config.window = None
+    config.win_sp = None
+    config.save_timings = {}
     config.errors["DateColMissing"] = f"One column must be called '{config.strings.datecol}'."
 
     config.dotstyle = {
@@ -42,41 +111,17 @@ def dashboard(config: Config):
         "linewidth": config.linewidth / 4,
     }
 
-    config = read_headers(config)
-
-    ############# DATA
-
-    alldata = pd.read_csv(config.csvdir + config.csv, header=1).fillna(0)
-    alldata.columns = list(config.hdrnew.keys())
-    alldata["Year"] = dates_to_years(config, alldata)
-
-    expend_count_cols = [col+"_count" for col in config.expend_cols]
-    alldata[expend_count_cols] = alldata[config.expend_cols].applymap(_expr_expend_count)
-    expend_price_cols = [col+"_price" for col in config.expend_cols]
-    alldata[expend_price_cols] = alldata[config.expend_cols].applymap(_expr_expend_price)
-
-    alldata[config.expend_cols] = alldata[config.expend_cols].applymap(_expr_expend)
-    alldata[config.cash_cols] = alldata[config.cash_cols].applymap(_expr)
-    alldata[config.income_cols] = alldata[config.income_cols].applymap(_expr)
 
+def derive_config(config, alldata):
+    """Set the year ranges and income categories derived from the ledger."""
     config.retire_yr = config.born_yr + config.retire_age
     ahead_yr = datetime.now(timezone.utc).year + config.future_window
     config.max_yr = min(ahead_yr, config.retire_yr)
 
-    config.since_yr = config.since_yr or min(alldata.Year)
-    config.until_yr = config.until_yr or max(alldata.Year)
+    config.until_yr = config.until_yr or int(max(alldata.Year))
     config.years_until_retire = config.max_yr - config.since_yr
     config.age_at_retire = config.max_yr - config.born_yr
 
-    alldata["Days"] = dates_to_days(config, alldata)
-    alldata["totalSuper"] = alldata[config.super_cols].sum(axis=1)
-    alldata["totalShares"] = alldata[config.shares_cols].sum(axis=1)
-    alldata["totalCash"] = alldata[config.cash_cols].sum(axis=1)
-    alldata["totalExpend"] = alldata[config.expend_cols].sum(axis=1)
-    alldata["totalIncome"] = alldata[config.income_cols].sum(axis=1)
-    alldata["total"] = alldata["totalShares"] + alldata["totalSuper"] + alldata["totalCash"]
-
-    alldata = alldata.sort_values(by="Days").reset_index(drop=True)
     income_grand_tot = alldata["totalIncome"].sum()
     income_sum = alldata[config.income_cols].sum()
     config.income_minor = list(income_sum[income_sum < (1 - config.income_thresh) * income_grand_tot].keys())
@@ -89,41 +134,203 @@ def dashboard(config: Config):
     # config.cminor_bool = len(config.cash_minor) > 0
 
     config.years_uniq = {}
-    for x in alldata["Year"]:
+    for x in alldata["Year"].unique():
         if x >= config.since_yr and x <= config.until_yr:
-            config.years_uniq[x] = True
+            config.years_uniq[int(x)] = True
+
+
+############ WINDOW VIEWS
+
+
+class WindowView:
+    """
+    NumPy arrays of the columns of `data`, for the whole series and for the fitting window.
+
+    Built once per layout (as `config.window`) so that the panels do not
+    each re-slice `data` with the window mask. Arrays are extracted on first
+    use and cached.
+
+    Parameters
+    ----------
+    data : DataFrame
+        Ledger rows shown in the layout.
+    mask : array of bool
+        The rows of `data` in the fitting window (`config.window_ind`).
+    """
+
+    def __init__(self, data, mask):
+        self.data = data
+        self.mask = np.asarray(mask)
+        self._full = {}
+        self._window = {}
+        self._positive = {}
+        self._fits = {}
+        self.days = self.full("Days")
+
+    def full(self, name):
+        """Return the whole column `name`."""
+        if name not in self._full:
+            self._full[name] = self.data[name].to_numpy()
+        return self._full[name]
+
+    def window(self, name):
+        """Return the column `name` within the fitting window."""
+        if name not in self._window:
+            self._window[name] = self.full(name)[self.mask]
+        return self._window[name]
+
+    def positive(self, name, start=0):
+        """Return the days and values of `full(name)[start:-1]` which are positive, for log fits."""
+        key = (name, start)
+        if key not in self._positive:
+            vals = self.full(name)[start:-1]
+            ind = vals > 0
+            self._positive[key] = (self.days[start:-1][ind], vals[ind])
+        return self._positive[key]
+
+    def linear_fit(self, name):
+        """Return the (slope, intercept) of the least squares line through the window of `name`."""
+        key = ("linear", name)
+        if key not in self._fits:
+            self._fits[key] = fit_line(self.window("Days"), self.window(name))
+        return self._fits[key]
+
+    def exp_fit(self, name, start=None):
+        """
+        Return the (rate, log intercept) of the exponential fitted to `name`.
+
+        The fit is over the window, or if `start` is given over
+        `positive(name, start)`. Each point is weighted by its value, as for
+        `np.polyfit(days, np.log(vals), 1, w=np.sqrt(vals))`.
+        """
+        key = ("exp", name, start)
+        if key not in self._fits:
+            days, vals = self.window_or_positive(name, start)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._fits[key] = fit_line(days, np.log(vals), vals)
+        return self._fits[key]
+
+    def window_or_positive(self, name, start=None):
+        """Return the days and values of `name` used by `exp_fit()`."""
+        if start is None:
+            return self.window("Days"), self.window(name)
+        return self.positive(name, start)
+
+    def growth(self, name, start=None):
+        """Return the annual growth rate of the exponential fit of `name`."""
+        return np.exp(self.exp_fit(name, start)[0]) - 1
+
+    def crossing_times(self, name, targets):
+        """Return the days at which the linear fit of `name` reaches each of `targets`."""
+        slope, intercept = self.linear_fit(name)
+        return (np.asarray(targets, dtype=float) - intercept) / slope
+
+
+def fit_line(x, y, weights=None):
+    """
+    Closed-form (weighted) least squares fit of `y = slope * x + intercept`.
+
+    `weights` multiply the squared residuals. Returns (slope, intercept),
+    which are NaN if `x` has no spread.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    w = np.ones_like(x) if weights is None else np.asarray(weights, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        wsum = w.sum()
+        xm = (w * x).sum() / wsum
+        ym = (w * y).sum() / wsum
+        dx = x - xm
+        slope = (w * dx * (y - ym)).sum() / (w * dx * dx).sum()
+    return slope, ym - slope * xm
 
-    ########### CREATE FIGURE and AXES
 
-    if isinstance(config.layout, str):
-        config.layout = [config.layout]
+def window_view(view, data, mask):
+    """Return `view` if it was built for `data`, otherwise a new `WindowView` of `data` for `mask`."""
+    if view is not None and view.data is data:
+        return view
+    return WindowView(data, mask)
 
-    if "main7" in config.layout:
-        create_dashboard_main7(config, alldata)
 
-    if "plain8" in config.layout:
-        create_dashboard_plain8(config, alldata)
+############ LAYOUT TEMPLATES
 
-    if "income4" in config.layout:
-        create_dashboard_income4(config, alldata)
 
-    if "cash4" in config.layout:
-        create_dashboard_cash4(config, alldata)
+class LayoutTemplate:
+    """
+    The figure and axes of a layout, which can be cleared and reused.
+
+    Axes added while drawing the panels (e.g., with `twinx`) are removed by
+    `reset()`. From the layout axes only the data artists, legends, titles
+    and labels are removed, and the limits, scales and tick locators are
+    reset; the styling of the ticks, spines and grid is kept, as the panels
+    apply the same styling on every render.
+    """
+
+    def __init__(self, config, rects):
+        self.fig, ax0 = plt.subplots(
+            figsize=(config.figw, config.figh),
+            facecolor=config.colors.bg,
+        )
+        ax0.axis("off")
+        self.axes = [self.fig.add_axes(rect) for rect in rects]
+        self.keep = [ax0, *self.axes]
+
+    def reset(self):
+        for ax in list(self.fig.axes):
+            if ax not in self.keep:
+                ax.remove()
+        for ax in self.axes:
+            for artist in [*ax.lines, *ax.collections, *ax.patches, *ax.texts, *ax.images, *ax.tables, *ax.artists]:
+                artist.remove()
+            if ax.legend_ is not None:
+                ax.legend_.remove()
+            ax.containers.clear()
+            ax.set_title("")
+            ax.set_xlabel("")
+            ax.set_ylabel("")
+            ax.set_prop_cycle(None)
+            ax.set_xscale("linear")  # the default tick locators and formatters
+            ax.set_yscale("linear")
+            ax.relim()
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.set_autoscale_on(True)
+            ax.set_adjustable("box")  # changed by twinx()
+
+
+_templates = {}
+
+
+def layout_axes(config, name, rects):
+    """
+    Return the figure and the axes at the positions `rects` for a layout.
 
-    if "share4" in config.layout:
-        create_dashboard_share4(config, alldata)
+    With `config.headless` and `config.reuse_figures`, the figure is kept and
+    cleared for reuse by the next render of the same layout (in this process).
+    """
+    if not (config.headless and config.reuse_figures):
+        template = LayoutTemplate(config, rects)
+        return template.fig, template.axes
+
+    key = (name, config.figw, config.figh, config.colors.bg, tuple(tuple(rect) for rect in rects))
+    template = _templates.get(key)
+    if template is None:
+        template = _templates[key] = LayoutTemplate(config, rects)
+    else:
+        template.reset()
+    return template.fig, template.axes
 
-    if "ipad_1" in config.layout:
-        create_dashboard_ipad1(config, alldata)
 
 def create_dashboard_main7(config, alldata):
-    data = alldata[alldata.total > 0].reset_index(drop=True)
+    data = select_rows(alldata, alldata.total > 0)
     config.window_ind = data.Days > (data.Days.iat[-1] - config.linear_window)
+    config.window = WindowView(data, config.window_ind)
 
     # Calculate expenditure
     if config.expend_bool:
-        data_sp = alldata[alldata.totalExpend > 0].reset_index(drop=True)
+        data_sp = select_rows(alldata, alldata.totalExpend > 0)
         config.win_sp_ind = data_sp.Days > (data_sp.Days.iat[-1] - config.linear_window)
+        config.win_sp = WindowView(data_sp, config.win_sp_ind)
     else:
         data_sp = alldata  # dummy data, not used, to ensure variable exists
 
@@ -143,23 +350,20 @@ def create_dashboard_main7(config, alldata):
     inset_x = pane_x[0] + 0.15
     inset_y = row_y[1] + main_ht / 2 + 0.025
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4, ax5, ax6, ax7) = layout_axes(
+        config,
+        "main7",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [(1 - main_wd) / 2, row_y[1], main_wd, main_ht],
+            [pane_x[0], row_y[2], pane_w, pane_h],
+            [pane_x[1], row_y[2], pane_w, pane_h],
+            [pane_x[0], row_gap + row_y[0] + sankey_h, sankey_w, sankey_h],
+            [pane_x[1] - 0.02, row_gap + row_y[0] + sankey_h, sankey_w, sankey_h],
+            [pane_x[0], row_y[0], sankey_w, sankey_h],
+            [pane_x[1] - 0.02, row_y[0], sankey_w, sankey_h],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([(1 - main_wd) / 2, row_y[1], main_wd, main_ht])
-    ax2 = fig.add_axes([pane_x[0], row_y[2], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[1], row_y[2], pane_w, pane_h])
-
-    ax4 = fig.add_axes([pane_x[0], row_gap + row_y[0] + sankey_h, sankey_w, sankey_h])
-    ax5 = fig.add_axes([pane_x[1] - 0.02, row_gap + row_y[0] + sankey_h, sankey_w, sankey_h])
-
-    ax6 = fig.add_axes([pane_x[0], row_y[0], sankey_w, sankey_h])
-    ax7 = fig.add_axes([pane_x[1] - 0.02, row_y[0], sankey_w, sankey_h])
 
     if config.expend_bool:
         ax33 = ax3.twinx()
@@ -172,8 +376,9 @@ def create_dashboard_main7(config, alldata):
     panel_timeline(config, ax00)
     # Calculate expenditure
     if config.expend_bool:
-        data_sp = alldata[alldata.totalExpend > 0].reset_index(drop=True)
+        data_sp = select_rows(alldata, alldata.totalExpend > 0)
         config.win_sp_ind = data_sp.Days > (data_sp.Days.iat[-1] - config.linear_window)
+        config.win_sp = WindowView(data_sp, config.win_sp_ind)
     else:
         data_sp = alldata  # dummy data, not used, to ensure variable exists
 
@@ -208,19 +413,19 @@ def create_dashboard_main7(config, alldata):
 
     ############## FINISH UP
 
-    plt.show()
-    savefiles(config, fig)
-    plt.close()
+    return fig
 
 
 def create_dashboard_plain8(config, alldata):
-    data = alldata[alldata.total > 0].reset_index(drop=True)
+    data = select_rows(alldata, alldata.total > 0)
     config.window_ind = data.Days > (data.Days.iat[-1] - config.linear_window)
+    config.window = WindowView(data, config.window_ind)
 
     # Calculate expenditure
     if config.expend_bool:
-        data_sp = alldata[alldata.totalExpend > 0].reset_index(drop=True)
+        data_sp = select_rows(alldata, alldata.totalExpend > 0)
         config.win_sp_ind = data_sp.Days > (data_sp.Days.iat[-1] - config.linear_window)
+        config.win_sp = WindowView(data_sp, config.win_sp_ind)
     else:
         data_sp = alldata  # dummy data, not used, to ensure variable exists
 
@@ -232,23 +437,21 @@ def create_dashboard_plain8(config, alldata):
     pane_x = [0.125, 0.525]
     row_y = [0.1, 0.3, 0.5, 0.7]
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8) = layout_axes(
+        config,
+        "plain8",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [pane_x[0], row_y[0], pane_w, pane_h],
+            [pane_x[0], row_y[1], pane_w, pane_h],
+            [pane_x[0], row_y[2], pane_w, pane_h],
+            [pane_x[0], row_y[3], pane_w, pane_h],
+            [pane_x[1], row_y[0], sankey_w, sankey_h],
+            [pane_x[1], row_y[1], sankey_w, sankey_h],
+            [pane_x[1], row_y[2], sankey_w, sankey_h],
+            [pane_x[1], row_y[3], sankey_w, sankey_h],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([pane_x[0], row_y[0], pane_w, pane_h])
-    ax2 = fig.add_axes([pane_x[0], row_y[1], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[0], row_y[2], pane_w, pane_h])
-    ax4 = fig.add_axes([pane_x[0], row_y[3], pane_w, pane_h])
-
-    ax5 = fig.add_axes([pane_x[1], row_y[0], sankey_w, sankey_h])
-    ax6 = fig.add_axes([pane_x[1], row_y[1], sankey_w, sankey_h])
-    ax7 = fig.add_axes([pane_x[1], row_y[2], sankey_w, sankey_h])
-    ax8 = fig.add_axes([pane_x[1], row_y[3], sankey_w, sankey_h])
 
     ######## PANELS ########
 
@@ -268,17 +471,18 @@ def create_dashboard_plain8(config, alldata):
 
     ############## FINISH UP
 
-    plt.show()
-    plt.close()
+    return fig
 
 def create_dashboard_main8(config, alldata):
-    data = alldata[alldata.total > 0].reset_index(drop=True)
+    data = select_rows(alldata, alldata.total > 0)
     config.window_ind = data.Days > (data.Days.iat[-1] - config.linear_window)
+    config.window = WindowView(data, config.window_ind)
 
     # Calculate expenditure
     if config.expend_bool:
-        data_sp = alldata[alldata.totalExpend > 0].reset_index(drop=True)
+        data_sp = select_rows(alldata, alldata.totalExpend > 0)
         config.win_sp_ind = data_sp.Days > (data_sp.Days.iat[-1] - config.linear_window)
+        config.win_sp = WindowView(data_sp, config.win_sp_ind)
     else:
         data_sp = alldata  # dummy data, not used, to ensure variable exists
 
@@ -298,25 +502,21 @@ def create_dashboard_main8(config, alldata):
     inset_x = pane_x[0] + 0.15
     inset_y = row_y[1] + main_ht / 2 + 0.025
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8) = layout_axes(
+        config,
+        "main8",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [(1 - main_wd) / 2, row_y[1], main_wd, main_ht],
+            [pane_x[0], row_y[2], pane_w, pane_h],
+            [pane_x[1], row_y[2], pane_w, pane_h],
+            [pane_x[0], row_gap + row_y[0] + sankey_h, sankey_w, sankey_h],
+            [pane_x[1] - 0.02, row_gap + row_y[0] + sankey_h, sankey_w, sankey_h],
+            [pane_x[0], row_y[0], sankey_w, sankey_h],
+            [pane_x[1] - 0.02, row_y[0], sankey_w, sankey_h],
+            [inset_x, inset_y, inset_w, inset_h],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([(1 - main_wd) / 2, row_y[1], main_wd, main_ht])
-    ax2 = fig.add_axes([pane_x[0], row_y[2], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[1], row_y[2], pane_w, pane_h])
-
-    ax4 = fig.add_axes([pane_x[0], row_gap + row_y[0] + sankey_h, sankey_w, sankey_h])
-    ax5 = fig.add_axes([pane_x[1] - 0.02, row_gap + row_y[0] + sankey_h, sankey_w, sankey_h])
-
-    ax6 = fig.add_axes([pane_x[0], row_y[0], sankey_w, sankey_h])
-    ax7 = fig.add_axes([pane_x[1] - 0.02, row_y[0], sankey_w, sankey_h])
-
-    ax8 = fig.add_axes([inset_x, inset_y, inset_w, inset_h])
 
     if config.expend_bool:
         ax33 = ax3.twinx()
@@ -329,8 +529,9 @@ def create_dashboard_main8(config, alldata):
     panel_timeline(config, ax00)
     # Calculate expenditure
     if config.expend_bool:
-        data_sp = alldata[alldata.totalExpend > 0].reset_index(drop=True)
+        data_sp = select_rows(alldata, alldata.totalExpend > 0)
         config.win_sp_ind = data_sp.Days > (data_sp.Days.iat[-1] - config.linear_window)
+        config.win_sp = WindowView(data_sp, config.win_sp_ind)
     else:
         data_sp = alldata  # dummy data, not used, to ensure variable exists
 
@@ -373,9 +574,7 @@ def create_dashboard_main8(config, alldata):
 
     ############## FINISH UP
 
-    plt.show()
-    savefiles(config, fig)
-    plt.close()
+    return fig
 
 
 
@@ -387,18 +586,17 @@ def create_dashboard_income4(config, alldata):
     pane_x = [0.125, 0.575]
     row_y = [0.7, 0.5, 0.4, 0.1]
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4) = layout_axes(
+        config,
+        "income4",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [pane_x[0], row_y[0], pane_w, pane_h],
+            [1 - pane_x[0] - pane_w, row_y[0], pane_w, pane_h],
+            [pane_x[0], row_y[2], 1 - 2 * pane_x[0], 0.2],
+            [pane_x[0], row_y[3], 1 - 2 * pane_x[0], 0.2],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([pane_x[0], row_y[0], pane_w, pane_h])
-    ax2 = fig.add_axes([1 - pane_x[0] - pane_w, row_y[0], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[0], row_y[2], 1 - 2 * pane_x[0], 0.2])
-    ax4 = fig.add_axes([pane_x[0], row_y[3], 1 - 2 * pane_x[0], 0.2])
 
     ######## PANELS ########
 
@@ -411,14 +609,14 @@ def create_dashboard_income4(config, alldata):
     panel_income_window(config, ax4, alldata, thresh=[0, 300])
     panel_income_window(config, ax3, alldata, thresh=[300, 999999])
 
-    plt.show()
-    plt.close()
+    return fig
 
 
 
 def create_dashboard_cash4(config, alldata):
-    data = alldata[alldata.total > 0].reset_index(drop=True)
+    data = select_rows(alldata, alldata.total > 0)
     config.window_ind = data.Days > (data.Days.iat[-1] - config.linear_window)
+    config.window = WindowView(data, config.window_ind)
 
     pane_w = 0.35
     pane_h = 0.15
@@ -426,18 +624,17 @@ def create_dashboard_cash4(config, alldata):
     pane_x = [0.125, 0.575]
     row_y = [0.7, 0.5, 0.4, 0.1]
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4) = layout_axes(
+        config,
+        "cash4",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [pane_x[0], row_y[0], pane_w, pane_h],
+            [1 - pane_x[0] - pane_w, row_y[0], pane_w, pane_h],
+            [pane_x[0], row_y[2], 1 - 2 * pane_x[0], 0.2],
+            [pane_x[0], row_y[3], 1 - 2 * pane_x[0], 0.2],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([pane_x[0], row_y[0], pane_w, pane_h])
-    ax2 = fig.add_axes([1 - pane_x[0] - pane_w, row_y[0], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[0], row_y[2], 1 - 2 * pane_x[0], 0.2])
-    ax4 = fig.add_axes([pane_x[0], row_y[3], 1 - 2 * pane_x[0], 0.2])
 
     ######## PANELS ########
 
@@ -450,8 +647,7 @@ def create_dashboard_cash4(config, alldata):
     panel_cash_window_detail(config, ax3, data,thresh=[30000, 999999])
     panel_cash_window_detail(config, ax4, data,thresh=[0, 30000])
 
-    plt.show()
-    plt.close()
+    return fig
 
 
 def create_dashboard_share4(config, alldata):
@@ -461,8 +657,10 @@ def create_dashboard_share4(config, alldata):
     fund_col = share_col+"_Fund"
     val_col = "Shares_"+fund
     expend_col = "Expend_"+share_col
-    data = alldata[alldata[fund_col] == fund].reset_index(drop=True)
+    data = select_rows(alldata, alldata[fund_col] == fund)
+    data = data.assign(**{expend_col + "_price": expend_price(data, expend_col)})
     config.window_ind = data.Days > (data.Days.iat[-1] - config.linear_window)
+    config.window = WindowView(data, config.window_ind)
 
     fund_count = sum(data[expend_col+"_count"])
     pane_w = 0.35
@@ -471,18 +669,17 @@ def create_dashboard_share4(config, alldata):
     pane_x = [0.125, 0.575]
     row_y = [0.7, 0.5, 0.4, 0.1]
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4) = layout_axes(
+        config,
+        "share4",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [pane_x[0], row_y[0], pane_w, pane_h],
+            [1 - pane_x[0] - pane_w, row_y[0], pane_w, pane_h],
+            [pane_x[0], row_y[2], 1 - 2 * pane_x[0], 0.2],
+            [pane_x[0], row_y[3], 1 - 2 * pane_x[0], 0.2],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([pane_x[0], row_y[0], pane_w, pane_h])
-    ax2 = fig.add_axes([1 - pane_x[0] - pane_w, row_y[0], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[0], row_y[2], 1 - 2 * pane_x[0], 0.2])
-    ax4 = fig.add_axes([pane_x[0], row_y[3], 1 - 2 * pane_x[0], 0.2])
 
     ######## PANELS ########
 
@@ -513,8 +710,7 @@ def create_dashboard_share4(config, alldata):
     panel_expend_share_detail(config, ax44, data, expend_col+"_price", legend="Price", grid=False)
     yticks_dollars(config, ax44)
 
-    plt.show()
-    plt.close()
+    return fig
 
 
 
@@ -522,13 +718,15 @@ def create_dashboard_ipad1(config, alldata):
     
     config.figw = 25
     config.figh = 15
-    data = alldata[alldata.total > 0].reset_index(drop=True)
+    data = select_rows(alldata, alldata.total > 0)
     config.window_ind = data.Days > (data.Days.iat[-1] - config.linear_window)
+    config.window = WindowView(data, config.window_ind)
 
     # Calculate expenditure
     if config.expend_bool:
-        data_sp = alldata[alldata.totalExpend > 0].reset_index(drop=True)
+        data_sp = select_rows(alldata, alldata.totalExpend > 0)
         config.win_sp_ind = data_sp.Days > (data_sp.Days.iat[-1] - config.linear_window)
+        config.win_sp = WindowView(data_sp, config.win_sp_ind)
     else:
         data_sp = alldata  # dummy data, not used, to ensure variable exists
 
@@ -540,23 +738,21 @@ def create_dashboard_ipad1(config, alldata):
     pane_x = [0.125, 0.525]
     row_y = [0.1, 0.3, 0.5, 0.7]
 
-    fig, ax0 = plt.subplots(
-        figsize=(config.figw, config.figh),
-        facecolor=config.colors.bg,
+    fig, (ax00, ax1, ax2, ax3, ax4, ax5, ax6, ax7, ax8) = layout_axes(
+        config,
+        "ipad_1",
+        [
+            [0.02, 0.93, 0.96, 0.05],
+            [pane_x[0], row_y[0], pane_w, pane_h],
+            [pane_x[0], row_y[1], pane_w, pane_h],
+            [pane_x[0], row_y[2], pane_w, pane_h],
+            [pane_x[0], row_y[3], pane_w, pane_h],
+            [pane_x[1], row_y[0], sankey_w, sankey_h],
+            [pane_x[1], row_y[1], sankey_w, sankey_h],
+            [pane_x[1], row_y[2], sankey_w, sankey_h],
+            [pane_x[1], row_y[3], sankey_w, sankey_h],
+        ],
     )
-    ax0.axis("off")
-
-    ax00 = fig.add_axes([0.02, 0.93, 0.96, 0.05])
-
-    ax1 = fig.add_axes([pane_x[0], row_y[0], pane_w, pane_h])
-    ax2 = fig.add_axes([pane_x[0], row_y[1], pane_w, pane_h])
-    ax3 = fig.add_axes([pane_x[0], row_y[2], pane_w, pane_h])
-    ax4 = fig.add_axes([pane_x[0], row_y[3], pane_w, pane_h])
-
-    ax5 = fig.add_axes([pane_x[1], row_y[0], sankey_w, sankey_h])
-    ax6 = fig.add_axes([pane_x[1], row_y[1], sankey_w, sankey_h])
-    ax7 = fig.add_axes([pane_x[1], row_y[2], sankey_w, sankey_h])
-    ax8 = fig.add_axes([pane_x[1], row_y[3], sankey_w, sankey_h])
 
     ######## PANELS ########
 
@@ -576,30 +772,420 @@ def create_dashboard_ipad1(config, alldata):
 
     ############## FINISH UP
 
-    plt.show()
-    plt.close()
+    return fig
+
+LAYOUTS = {
+    "main7": create_dashboard_main7,
+    "plain8": create_dashboard_plain8,
+    "income4": create_dashboard_income4,
+    "cash4": create_dashboard_cash4,
+    "share4": create_dashboard_share4,
+    "ipad_1": create_dashboard_ipad1,
+}
+
+
+def render_layout(config, alldata, name):
+    """Create one layout, then show and save it (showing is skipped if `config.headless`)."""
+    with span(config, name):
+        with span(config, "create"):
+            fig = LAYOUTS[name](config, alldata)
+        if not config.headless:
+            with span(config, "show"):
+                plt.show()
+        with span(config, "save"):
+            savefiles(config, fig, name)
+        plt.close(fig)
+    return fig
+
+
+############ PARALLEL RENDERING
+
+_worker = {}
+
+
+def render_parallel(config, alldata, layouts):
+    """
+    Render each layout in a separate worker process using the Agg backend.
+
+    The processed ledger is sent once to each worker rather than once per layout.
+    The figures are pickled back to the calling process.
+    """
+    config = copy.copy(config)
+    config.year_summaries = {}  # holds weakrefs, which cannot be pickled
+    config.spans = None  # the workers' timings are not collected
+
+    with ProcessPoolExecutor(
+        max_workers=min(config.workers, len(layouts)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(config, alldata),
+    ) as pool:
+        futures = {name: pool.submit(_render_worker, name) for name in layouts}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _init_worker(config, alldata):
+    plt.switch_backend("Agg")
+    _worker["config"] = config
+    _worker["alldata"] = alldata
+
+
+def _render_worker(name):
+    config = copy.copy(_worker["config"])
+    config.headless = True
+    return render_layout(config, _worker["alldata"], name)
+
 
 ############ SUBFUNCTIONS
 
 
-def read_headers(config):
+def build_ledger(config, source=None):
+    """
+    Read and process the CSV into the `alldata` frame used by all layouts.
+
+    `source` is passed through to `read_ledger()`.
+    """
+    if config.chunksize:
+        with span(config, "stream_ledger"):
+            alldata = stream_ledger(config, source)
+    else:
+        with span(config, "read_ledger"):
+            config, alldata = read_ledger(config, source)
+        alldata = process_ledger(config, alldata)
+    return tag_ledger(config, sort_by_days(alldata))
+
+
+def tag_ledger(config, alldata):
+    """
+    Record the CSV header and `since_yr` of `config` in `alldata.attrs`.
+
+    `dashboard()` restores them from a ledger passed to it, as the ledger
+    only holds the processed columns.
+    """
+    alldata.attrs["hdrrows"] = tuple(tuple(row) for row in config.hdrrows)
+    alldata.attrs["since_yr"] = config.since_yr
+    return alldata
+
+
+def sort_by_days(alldata):
+    """Sort the ledger by `Days` (stably), without a copy if it is already in order."""
+    if np.all(np.diff(alldata["Days"].to_numpy()) >= 0):
+        alldata.index = pd.RangeIndex(len(alldata))
+        return alldata
+    return alldata.sort_values(by="Days", kind="stable").reset_index(drop=True)
+
+
+def stream_ledger(config, source=None):
+    """
+    Read and process the CSV `config.chunksize` rows at a time.
+
+    Each chunk is processed as by `process_ledger()` and only its processed
+    columns (dates, compact amounts and totals) are kept, so the raw text and
+    intermediate copies are never held for more than one chunk. Columns
+    not in one of the categories are dropped, other than those read by a
+    layout (see `extra_columns()`).
+
+    Returns
+    -------
+    alldata
+        The unsorted ledger, as from `process_ledger()`.
+    """
+    if source is None:
+        source = config.csvdir + config.csv
+    since_yr = config.since_yr
+
+    chunks = []
+    with _open_csv(source) as f:
+        cats, names = _read_header_rows(f)
+        config = _parse_headers(config, cats, names)
+        cols = config.super_cols + config.shares_cols + config.cash_cols + config.expend_cols + config.income_cols
+        keep = [config.strings.datecol, *cols, *extra_columns(config)]
+        reader = pd.read_csv(f, header=None, names=list(config.hdrnew.keys()), usecols=keep, chunksize=config.chunksize)
+        for chunk in reader:
+            chunks.append(process_ledger(config, chunk.fillna(0)))
+
+    alldata = pd.concat(chunks, ignore_index=True)
+    del chunks
+    if since_yr is None and int(min(alldata.Year)) < config.since_yr:
+        # `Days` of the earlier chunks were counted from a later year
+        config.since_yr = int(min(alldata.Year))
+        alldata["Days"] = dates_to_days(config, alldata)
+    return alldata
+
+
+def process_ledger(config, alldata):
+    """
+    Evaluate expression cells and add the `Year`, `Days` and `total*` columns.
+
+    Rows are processed independently of each other, so this is also used for
+    rows appended to a cached ledger. `config.since_yr` is resolved from the
+    data if not set.
+    """
+    evaluate_ledger(config, alldata)
+    add_totals(config, alldata)
+
+    for col in config.super_cols + config.shares_cols + config.cash_cols + config.expend_cols + config.income_cols:
+        alldata[col] = _compact(alldata[col].to_numpy(dtype=float))
+
+    return alldata
+
+
+def evaluate_ledger(config, alldata):
+    """Parse the dates (adding `Year`) and evaluate the expression cells of the raw CSV rows in place."""
+    with span(config, "dates"):
+        alldata[config.strings.datecol] = parse_dates(config, alldata)
+        alldata["Year"] = dates_to_years(config, alldata)
+
+    with span(config, "expressions"):
+        expend = expr_expend_columns(alldata, config.expend_cols)
+        alldata[list(expend.columns)] = expend
+        alldata[config.cash_cols] = expr_columns(alldata, config.cash_cols)
+        alldata[config.income_cols] = expr_columns(alldata, config.income_cols)
+
+
+def add_totals(config, alldata):
+    """
+    Add the `Days` and `total*` columns to the evaluated ledger in place.
+
+    `config.since_yr` is resolved from the data if not set.
+    """
+    config.since_yr = config.since_yr or int(min(alldata.Year))
+
+    alldata["Days"] = dates_to_days(config, alldata)
+    alldata["totalSuper"] = _row_total(alldata, config.super_cols)
+    alldata["totalShares"] = _row_total(alldata, config.shares_cols)
+    alldata["totalCash"] = _row_total(alldata, config.cash_cols)
+    alldata["totalExpend"] = _row_total(alldata, config.expend_cols)
+    alldata["totalIncome"] = _row_total(alldata, config.income_cols)
+    alldata["total"] = alldata["totalShares"] + alldata["totalSuper"] + alldata["totalCash"]
+
+
+def _row_total(alldata, cols):
+    """Sum the columns `cols` of each row in float64."""
+    return alldata[cols].to_numpy(dtype=float).sum(axis=1)
+
+
+def _compact(values):
+    """
+    Return the float64 array `values` as float32 if no value changes.
+
+    This holds for the whole-dollar (and most whole-cent) amounts of a
+    typical ledger. Totals and per-year aggregates are always computed in
+    float64.
+    """
+    narrow = values.astype(np.float32)
+    if np.array_equal(narrow, values, equal_nan=True):
+        return narrow
+    return values
+
+
+def select_rows(data, mask):
+    """
+    Return the rows of `data` where `mask` is true, numbered from zero.
+
+    If every row is selected, `data` itself is returned rather than a copy
+    (so that its per-year summary is shared as well). The selection is only
+    copied once, rather than again by `reset_index()`.
+    """
+    mask = np.asarray(mask)
+    if mask.all():
+        return data
+    rows = data[mask]
+    rows.index = pd.RangeIndex(len(rows))
+    return rows
+
+
+def append_ledger(config, alldata, tail, since_yr=None):
+    """
+    Process CSV rows appended since `alldata` was built and merge them in.
+
+    Returns None if a full rebuild is needed, i.e., if the new rows start
+    before the year that `Days` was computed from and `since_yr` was not
+    specified by the user.
+    """
+    try:
+        newrows = pd.read_csv(io.BytesIO(tail), header=None, names=list(config.hdrnew.keys())).fillna(0)
+    except pd.errors.EmptyDataError:
+        return alldata
+
+    newrows = process_ledger(config, newrows)
+    if since_yr is None and min(newrows.Year) < config.since_yr:
+        return None
+
+    return tag_ledger(config, sort_by_days(pd.concat([alldata, newrows], ignore_index=True)))
+
+
+def load_ledger(config):
+    """
+    Return the processed ledger, reusing the on-disk cache if `config.cache` is set.
+
+    If the modification time and size of the CSV file are unchanged since the
+    cache was written, the file is not read at all. If it has only been
+    appended to, only the new rows are read and processed. Any other change
+    to the file triggers a full rebuild.
+
+    A binary ledger written by `convert_ledger()` is memory-mapped instead
+    (see `map_ledger()`), whatever its filename unless it ends in `.csv`.
+    """
+    path = config.csvdir + config.csv
+    if not config.csv.lower().endswith(".csv") and binary.is_binary_ledger(path):
+        with span(config, "map_ledger"):
+            return map_ledger(config, path)
+
+    if not config.cache:
+        return build_ledger(config)
+
+    key = cache.cache_key(config)
+    stat = cache.csv_stat(path)
+
+    cached = cache.read_cache(config, key)
+    if cached is not None:
+        alldata, meta = cached
+        if stat is not None and stat == meta["stat"]:
+            prefix, digest, tail = meta["hash"], meta["hash"], b""
+        else:
+            prefix, digest, tail = cache.read_appended(path, meta["size"])
+        if prefix == meta["hash"] and len(alldata) == meta["rows"]:
+            config = _parse_headers(config, *meta["extra"]["hdrrows"])
+            config.since_yr = meta["extra"]["since_yr"]
+            if not tail:
+                tag_ledger(config, alldata)
+                if stat is not None and stat != meta["stat"]:
+                    # unchanged but touched (or just written): record the stat for next time
+                    csv_state = {"size": meta["size"], "hash": meta["hash"], "eol": meta["eol"], "stat": stat}
+                    cache.write_cache(config, key, alldata, csv_state, meta["extra"])
+                return alldata
+            if meta["eol"]:
+                alldata = append_ledger(config, alldata, tail, since_yr=key["since_yr"])
+                if alldata is not None:
+                    csv_state = {"size": meta["size"] + len(tail), "hash": digest, "eol": tail.endswith(b"\n"), "stat": stat}
+                    cache.write_cache(config, key, alldata, csv_state, meta["extra"])
+                    return alldata
+            config.since_yr = key["since_yr"]
+
+    _, digest, raw = cache.read_appended(path)
+    alldata = build_ledger(config, raw)
+    csv_state = {"size": len(raw), "hash": digest, "eol": raw.endswith(b"\n"), "stat": stat}
+    cache.write_cache(config, key, alldata, csv_state, {"hdrrows": config.hdrrows, "since_yr": config.since_yr})
+    return alldata
+
+
+def convert_ledger(config, dest=None):
+    """
+    Convert the CSV file of `config` into a binary ledger, which `dashboard()` reads without parsing.
+
+    Dates are stored as datetime64, amounts (with their expressions
+    evaluated) as float64, the counts of Expend cells as int32 and the
+    "Fund" column of each Expend column (see `Config.share_focus`) as
+    fixed-width strings, in date order. Other columns not in one of the
+    categories are not stored.
+
+    Parameters
+    ----------
+    config : Config
+    dest : str or path
+        Defaults to the CSV filename with the extension `.nwdl`.
+
+    Returns
+    -------
+    The path of the binary ledger.
+    """
+    if dest is None:
+        dest = config.csvdir + os.path.splitext(config.csv)[0] + binary.BINARY_SUFFIX
+
+    config, raw = read_ledger(config)
+    evaluate_ledger(config, raw)
     datecol = config.strings.datecol
+    raw = raw.sort_values(by=datecol, kind="stable")
 
-    hdr = pd.read_csv(config.csvdir + config.csv, header=None, nrows=2).transpose()
+    cols = config.super_cols + config.shares_cols + config.cash_cols + config.expend_cols + config.income_cols
+    columns = {datecol: raw[datecol].to_numpy(dtype="datetime64[ns]")}
+    columns |= {col: raw[col].to_numpy(dtype=np.float64) for col in cols}
+    columns |= {col + "_count": raw[col + "_count"].to_numpy(dtype=np.int32) for col in config.expend_cols}
+    fund_cols = [config.hdrnew[col] + "_Fund" for col in config.expend_cols]
+    fund_cols = [col for col in fund_cols if col in config.hdrnew]
+    columns |= {col: raw[col].astype(str).to_numpy(dtype=str) for col in fund_cols}
+    binary.write_binary_ledger(dest, config.hdrrows, columns)
+    return dest
+
+
+def map_ledger(config, path):
+    """
+    Return the ledger of a binary file written by `convert_ledger()`.
+
+    The stored columns are memory-mapped rather than read or copied; only
+    the `Year`, `Days` and `total*` columns are computed.
+    """
+    meta, columns = binary.read_binary_ledger(path)
+    config = _parse_headers(config, *meta["hdrrows"])
+    alldata = pd.DataFrame(columns, copy=False)
+    alldata["Year"] = dates_to_years(config, alldata)
+    add_totals(config, alldata)
+    return tag_ledger(config, sort_by_days(alldata))
+
+
+@contextmanager
+def _open_csv(source):
+    """
+    Yield a text handle for a CSV path, open binary/text handle, or bytes.
+
+    A UTF-8 byte order mark at the start is skipped, as by `pd.read_csv()`.
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            yield f
+    elif isinstance(source, io.TextIOBase):
+        yield source
+    else:
+        f = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+        try:
+            yield f
+        finally:
+            f.detach()  # leave the caller's handle open
 
-    hdrnew = {}
-    for ii, _ in enumerate(hdr[1]):
-        prefix = hdr[0][ii] if isinstance(hdr[0][ii], str) else "_"
-        tmpstr = datecol if hdr[1][ii] == datecol else prefix + "_" + hdr[1][ii]
-        hdrnew[tmpstr] = hdr[1][ii]
 
-    hdr[1] = list(hdrnew.keys())
+def _read_header_rows(f):
+    cats = next(csv.reader([f.readline()]))
+    names = next(csv.reader([f.readline()]))
+    return cats, names
+
+
+def extra_columns(config):
+    """
+    Return the columns outside the categories that a layout reads.
+
+    That is the "Fund" column of the Expend column in `config.share_focus`
+    (for the share4 layout), if it is set and in the CSV file.
+    """
+    focus = config.share_focus
+    if focus is None:
+        return []
+    fund_col = focus["expend_col"] + "_Fund"
+    return [fund_col] if fund_col in config.hdrnew else []
+
+
+def _parse_headers(config, cats, names):
+    datecol = config.strings.datecol
 
-    config.super_cols = list(hdr[1][hdr[0] == config.strings.supercol])
-    config.shares_cols = list(hdr[1][hdr[0] == config.strings.sharescol])
-    config.cash_cols = list(hdr[1][hdr[0] == config.strings.cashcol])
-    config.expend_cols = list(hdr[1][hdr[0] == config.strings.expendcol])
-    config.income_cols = list(hdr[1][hdr[0] == config.strings.incomecol])
+    hdrnew = {}
+    hdrcat = []
+    for cat, name in zip(cats, names):
+        prefix = cat or "_"
+        tmpstr = datecol if name == datecol else prefix + "_" + name
+        hdrnew[tmpstr] = name
+        hdrcat.append((cat, tmpstr))
+
+    def cols_of(category):
+        return [col for cat, col in hdrcat if cat == category]
+
+    config.super_cols = cols_of(config.strings.supercol)
+    config.shares_cols = cols_of(config.strings.sharescol)
+    config.cash_cols = cols_of(config.strings.cashcol)
+    config.expend_cols = cols_of(config.strings.expendcol)
+    config.income_cols = cols_of(config.strings.incomecol)
 
     config.super_bool = len(config.super_cols) > 0
     config.shares_bool = len(config.shares_cols) > 0
@@ -608,126 +1194,264 @@ def read_headers(config):
     config.income_bool = len(config.income_cols) > 0
 
     config.hdrnew = hdrnew
+    config.hdrrows = (list(cats), list(names))
 
     return config
 
 
-def savefiles(config, fig):
+def read_headers(config):
+    with _open_csv(config.csvdir + config.csv) as f:
+        cats, names = _read_header_rows(f)
+    return _parse_headers(config, cats, names)
+
+
+def read_ledger(config, source=None):
+    """
+    Read the two-row header and the body of the CSV in a single pass.
+
+    Parameters
+    ----------
+    config : Config
+        The header mapping (`hdrnew`, `super_cols`, `shares_cols`, etc.) is stored here.
+    source : str, path, file handle, or bytes
+        Defaults to `config.csvdir + config.csv`. Open handles (binary or text)
+        and in-memory buffers are read from their current position and left open.
+
+    Returns
+    -------
+    config, alldata
+    """
+    if source is None:
+        source = config.csvdir + config.csv
+
+    with _open_csv(source) as f:
+        cats, names = _read_header_rows(f)
+        config = _parse_headers(config, cats, names)
+        alldata = pd.read_csv(f, header=None, names=list(config.hdrnew.keys())).fillna(0)
+
+    return config, alldata
+
+
+def savefiles(config, fig, layout="main7"):
+    """
+    Save the figure in each enabled format, drawing it only once for PNG and JPG.
+
+    The seconds taken for each format are stored in `config.save_timings[layout]`.
+    """
     saveprefix = config.saveprefix or os.path.splitext(config.csv)[0]
     filename = config.savedir + saveprefix + "-" + datetime.now(timezone.utc).strftime(config.savesuffix)
 
+    if layout != "main7":
+        filename = filename + "-" + layout
     if config.anon:
         filename = filename + "-anon"
 
-    if config.savepdf or config.savepng or config.savejpg:
-        os.makedirs(config.savedir, exist_ok=True)
+    formats = [fmt for fmt, flag in [("pdf", config.savepdf), ("jpg", config.savejpg), ("png", config.savepng)] if flag]
+    if not formats:
+        return
 
-    if config.savepdf:
-        fig.savefig(filename + ".pdf")
-    if config.savejpg:
-        fig.savefig(filename + ".jpg")
-    if config.savepng:
-        fig.savefig(filename + ".png")
+    os.makedirs(config.savedir, exist_ok=True)
 
+    timings = {}
+    for fmt, content in render_bytes(fig, formats, timings=timings).items():
+        with open(filename + "." + fmt, "wb") as f:
+            f.write(content)
+    config.save_timings[layout] = timings
 
-def dates_to_years(config, alldata):
+
+RASTER_FORMATS = ("png", "jpg", "jpeg")
+
+
+def _savefig_facecolor(fig):
+    """The background colour of `fig` when saved, as an RGB triplet of 0-255 integers."""
+    facecolor = mpl.rcParams["savefig.facecolor"]
+    if isinstance(facecolor, str) and facecolor == "auto":
+        facecolor = fig.get_facecolor()
+    return tuple(round(255 * c) for c in mcolors.to_rgb(facecolor))
+
+
+def render_bytes(fig, formats=("png",), timings=None):
+    """
+    Render a figure in memory, without touching the filesystem.
+
+    Raster formats (PNG, JPG) are encoded from a single Agg draw of the figure;
+    vector formats (PDF, SVG, ...) are each drawn by their matplotlib backend.
+
+    Parameters
+    ----------
+    fig : Figure
+        For example, one of the figures returned by `dashboard()`.
+    formats : list[str]
+        File formats (extensions) to render.
+    timings : dict
+        If given, filled with the seconds taken for the shared raster draw
+        (key "draw") and for encoding each format.
+
+    Returns
+    -------
+    dict
+        The encoded bytes for each format.
+    """
+    out = {}
+    formats = [fmt.lower() for fmt in formats]
+    timings = {} if timings is None else timings
+
+    if any(fmt in RASTER_FORMATS for fmt in formats):
+        start = time.perf_counter()
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        image = Image.frombuffer("RGBA", canvas.get_width_height(), canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+        timings["draw"] = time.perf_counter() - start
+        dpi = (fig.dpi, fig.dpi)
+        for fmt in formats:
+            if fmt in RASTER_FORMATS:
+                start = time.perf_counter()
+                buf = io.BytesIO()
+                if fmt == "png":
+                    image.save(buf, format="png", dpi=dpi)
+                else:
+                    # JPG has no alpha: composite onto the background as `savefig()` would
+                    opaque = Image.new("RGB", image.size, _savefig_facecolor(fig))
+                    opaque.paste(image, mask=image)
+                    opaque.save(buf, format="jpeg", dpi=dpi)
+                out[fmt] = buf.getvalue()
+                timings[fmt] = time.perf_counter() - start
+
+    for fmt in formats:
+        if fmt not in RASTER_FORMATS:
+            start = time.perf_counter()
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt)
+            out[fmt] = buf.getvalue()
+            timings[fmt] = time.perf_counter() - start
+
+    return out
+
+
+def render_dashboard(config, formats=("png",)):
+    """
+    Create the dashboard layouts in memory, e.g., for serving over HTTP.
+
+    The config is copied with `headless=True` and no files are saved.
+
+    Returns
+    -------
+    dict
+        For each layout name, a dict of the encoded bytes for each format.
+    """
+    config = replace(config, headless=True, savepdf=False, savejpg=False, savepng=False)
+    figs = dashboard(config)
+    return {name: render_bytes(fig, formats) for name, fig in figs.items()}
+
+
+def parse_dates(config, alldata):
+    """Parse the date column once into datetime64 using `config.datefmt`."""
     datecol = config.strings.datecol
     allcols = alldata.columns.tolist()
     if datecol not in allcols:
-        raise RuntimeError(config.errors.DateColMissing)
+        raise RuntimeError(config.errors["DateColMissing"])
+
+    return pd.to_datetime(alldata[datecol], format=config.datefmt)
 
-    return alldata[datecol].apply(lambda x: datetime.strptime(x, config.datefmt).replace(tzinfo=timezone.utc).year)
+
+def dates_to_years(config, alldata):
+    return alldata[config.strings.datecol].dt.year.astype(np.int16)
 
 
 def dates_to_days(config, data):
     datecol = config.strings.datecol
-    sincedate = datetime(config.since_yr, 1, 1, tzinfo=timezone.utc)
-    days = np.empty(len(data[datecol]))
-    for ii, ent in enumerate(data[datecol]):
-        y = datetime.strptime(ent, config.datefmt).replace(tzinfo=timezone.utc)
-        days[ii] = (y - sincedate).days / 365
-    return days
+    sincedate = np.datetime64(f"{int(config.since_yr):04d}-01-01")
+    elapsed = data[datecol].to_numpy(dtype="datetime64[ns]") - sincedate
+    return (elapsed // np.timedelta64(1, "D")) / 365
+
+
+_EXPR_ADDSUB = re.compile(r"([+-])")
 
 
-# from Claude:
+@lru_cache(maxsize=4096)
 def _expr(value):
-    try:
-        # Handle math expressions like "20 x 4 + 10"
-        if any(op in value for op in ["x", "+", "-", "*"]):
-            # Replace 'x' with '*' for Python and clean up
-            expr = value.replace("x", "*").replace("$", "").strip()
-
-            # Simple arithmetic parser for basic expressions
-            # Split by + and - first (lowest precedence)
-            current = ""
-            sign = 1
-            total = 0
-
-            i = 0
-            while i < len(expr):
-                if expr[i] in "+-":
-                    if current.strip():
-                        total += sign * _evaluate_multiply_divide(current.strip())
-                        current = ""
-                    sign = 1 if expr[i] == "+" else -1
-                else:
-                    current += expr[i]
-                i += 1
-
-            if current.strip():
-                total += sign * _evaluate_multiply_divide(current.strip())
-
-            return total
-        # Simple number
-        return float(value.replace("$", ""))
-    except (ValueError, TypeError):
-        return float(value)
-
-def _expr_expend(value: str | int) -> int | float:
-    if isinstance(value, int) or isinstance(value, float):
-        return value
-    value = value.replace("$","").replace(" ","")
-    if not("x" in value):
-        return float(value)
-    vals = value.split("x")
-    assert len(vals) == 2, "Can only split fund expend into '[-] count x price'"
-    return int(vals[0])*float(vals[1])
-
-def _expr_expend_count(value: str | int) -> int | float:
-    if isinstance(value, int) or isinstance(value, float):
-        return value
-    value = value.replace("$","").replace(" ","")
-    if not("x" in value):
-        return 0
-    vals = value.split("x")
-    assert len(vals) == 2, "Can only split fund expend into '[-] count x price'"
-    return int(vals[0])
-
-def _expr_expend_price(value: str | int) -> int | float:
-    if isinstance(value, int) or isinstance(value, float):
-        return value
-    value = value.replace("$","").replace(" ","")
-    if not("x" in value):
-        return 0.0
+    """Evaluate a cell expression like "20 x 4 + 10" (also "$" signs and "*")."""
+    expr = value.replace("$", "").replace("x", "*")
+
+    total = 0.0
+    sign = 1
+    for token in _EXPR_ADDSUB.split(expr):
+        if token in ("+", "-"):
+            sign = 1 if token == "+" else -1
+        elif token.strip():
+            term = 1.0
+            for factor in token.split("*"):
+                term *= float(factor)
+            total += sign * term
+    return total
+
+
+@lru_cache(maxsize=4096)
+def _expr_expend(value):
+    """Evaluate an Expend cell like "10 x 25.5", returning (value, count, price)."""
+    value = value.replace("$", "").replace(" ", "")
+    if "x" not in value:
+        return float(value), 0, 0.0
     vals = value.split("x")
-    assert len(vals) == 2, "Can only split fund expend into '[-] count x price'"
-    return float(vals[1])
+    if len(vals) != 2:
+        error_msg = f"Can only split fund expend into '[-] count x price', not '{value}'"
+        raise ValueError(error_msg)
+    count = int(vals[0])
+    price = float(vals[1])
+    return count * price, count, price
+
+
+def _expr_column(series, cell_fn, nout=1):
+    """
+    Evaluate one expression column into an array of shape (len(series), nout).
+
+    Numeric columns are cast directly; otherwise only the cells which do not
+    parse as plain numbers are passed through `cell_fn`.
+    """
+    vals = np.zeros((len(series), nout))
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        vals[:, 0] = series.to_numpy(dtype=float)
+        return vals
+
+    vals[:, 0] = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    for ii in np.flatnonzero(np.isnan(vals[:, 0])):
+        vals[ii] = cell_fn(str(series.iat[ii]))
+    return vals
+
+
+def expr_columns(data, cols):
+    """Evaluate the expression cells of columns `cols` as floats."""
+    return pd.DataFrame(
+        {col: _expr_column(data[col], _expr)[:, 0] for col in cols},
+        index=data.index,
+    )
+
 
-def _evaluate_multiply_divide(expr):
-    """Helper function to evaluate multiplication and division."""
-    # Handle multiplication only for now (as the example uses 'x')
-    if "*" in expr:
-        parts = expr.split("*")
-        result = 1.0
-        for part in parts:
-            result *= float(part.strip())
-        return result
-    return float(expr)
+def expr_expend_columns(data, cols):
+    """
+    Evaluate Expend columns, adding a `_count` column for each.
+
+    The price of "count x price" cells is not stored, see `expend_price()`.
+    """
+    values, counts = {}, {}
+    for col in cols:
+        vals = _expr_column(data[col], _expr_expend, nout=3)
+        values[col] = vals[:, 0]
+        counts[col + "_count"] = vals[:, 1].astype(np.int32)
+    return pd.DataFrame(values | counts, index=data.index)
+
+
+def expend_price(data, col):
+    """Return the unit price of the "count x price" cells of Expend column `col` (zero for other cells)."""
+    counts = data[col + "_count"].to_numpy()
+    values = data[col].to_numpy(dtype=float)
+    return np.divide(values, counts, out=np.zeros(len(values)), where=counts != 0)
 
 
 ############## MINI PANEL: Timeline
 
 
+@timed
 def panel_timeline(config, ax):
     color_axes(config, ax)
     ax.axis("off")
@@ -748,28 +1472,22 @@ def panel_timeline(config, ax):
 
     ax.plot([0, 1], [1, 1], "-", color=config.colors.frame)
 
+    # the progress dots, filled up to today, and the marker of today drawn
+    # last (on top) as one collection
     npoints = 26
-    edgecol = config.colors.frame
-    for ii in range(npoints):
-        jj = ii / (npoints - 1)
-        facecol = config.colors.frame
-        if jj > percentage:
-            facecol = config.colors.bg
-
-        ax.plot(
-            [jj],
-            [1],
-            "o",
-            markeredgecolor=edgecol,
-            markerfacecolor=facecol,
-        )
-
-    ax.plot(
-        [xx],
-        [1],
-        "o",
-        markeredgecolor=edgecol,
-        markerfacecolor=config.colors.total,
+    xs = np.append(np.linspace(0, 1, npoints), xx)
+    bg, frame, total = mcolors.to_rgba_array([config.colors.bg, config.colors.frame, config.colors.total])
+    facecols = np.where((xs > percentage)[:, None], bg, frame)
+    facecols[-1] = total
+    ax.scatter(
+        xs,
+        np.ones_like(xs),
+        s=mpl.rcParams["lines.markersize"] ** 2,
+        c=facecols,
+        edgecolors=config.colors.frame,
+        linewidths=mpl.rcParams["lines.markeredgewidth"],
+        zorder=2,
+        snap=True,
     )
     ax.set_xlim([-0.01, 1.01])
     ax.set_ylim([0, 2])
@@ -778,7 +1496,16 @@ def panel_timeline(config, ax):
 ############## PANEL 1: All vs Time
 
 
+@timed
 def panel_all_vs_time(config, ax, data):
+    """
+    Plot the net worth against time with its extrapolation to retirement.
+
+    Returns
+    -------
+    DataFrame
+        The years to each of `config.linear_targets`, see `target_projection()`.
+    """
     color_axes(config, ax)
     ax.set_title("", color=config.colors.title)
     ax.axvline(x=data.Days.iat[-1], linestyle="--", color=config.colors.dashes)
@@ -786,55 +1513,48 @@ def panel_all_vs_time(config, ax, data):
     if config.retire_yr == config.max_yr:
         ax.axvline(x=config.retire_yr - config.since_yr, linestyle="--", color=config.colors.dashes)
 
-    def extrap(d, t):
-        reg = np.polyfit(d, t, 1)
-        rd = np.linspace(data.Days[config.window_ind].iat[0], config.years_until_retire)
-        yd = rd * reg[0] + reg[1]
+    win = window_view(config.window, data, config.window_ind)
+
+    def extrap(name):
+        slope, intercept = win.linear_fit(name)
+        rd = np.linspace(win.window("Days")[0], config.years_until_retire)
+        yd = rd * slope + intercept
         return rd, yd
 
-    def extrap_exp(ax, d, t, arg):
+    def extrap_exp(ax, name, arg):
         clim = ax.get_ylim()
-        logfit = np.polyfit(d, np.log(t), 1, w=np.sqrt(t))
-        rd = np.linspace(d.iloc[0], config.years_until_retire)
-        yd = np.exp(logfit[1]) * np.exp(logfit[0] * rd)
-        infl = np.exp(logfit[0]) - 1
+        rate, logc = win.exp_fit(name, config.expstart)
+        rd = np.linspace(win.positive(name, config.expstart)[0][0], config.years_until_retire)
+        yd = np.exp(logc) * np.exp(rate * rd)
         ax.plot(rd, yd, **(config.projstyle | arg))
         ax.set_ylim(clim)
-        return infl
+        return win.growth(name, config.expstart)
 
     # total line
-    rd1, yd1 = extrap(data.Days[config.window_ind], data.total[config.window_ind])
+    rd1, yd1 = extrap("total")
     retire_worth = yd1[-1]
     ax.plot(rd1, yd1, **config.projstyle, color=config.colors.total)
-    extrap_exp(ax, data.Days[config.expstart : -1], data.total[config.expstart : -1], {"color": config.colors.total})
+    extrap_exp(ax, "total", {"color": config.colors.total})
 
-    ax.plot(data.Days, data.total, color=config.colors.total, **config.dotstyle)
+    plot_dots(config, ax, win.days, win.full("total"), color=config.colors.total)
 
     # super
     if config.super_bool:
-        rd2, yd2 = extrap(data.Days[config.window_ind], data.totalSuper[config.window_ind])
+        rd2, yd2 = extrap("totalSuper")
         ax.plot(rd2, yd2, **config.projstyle, color=config.colors.super)
+        extrap_exp(ax, "totalSuper", {"color": config.colors.super})
 
-        ind = data.totalSuper[config.expstart : -1] > 0
-        days = data.Days[config.expstart : -1][ind]
-        val = data.totalSuper[config.expstart : -1][ind]
-        extrap_exp(ax, days, val, {"color": config.colors.super})
-
-        ax.plot(data.Days, data.totalSuper, color=config.colors.super, **config.dotstyle)
+        plot_dots(config, ax, win.days, win.full("totalSuper"), color=config.colors.super)
 
     if config.shares_bool:
-        rd3, yd3 = extrap(data.Days[config.window_ind], data.totalShares[config.window_ind])
+        rd3, yd3 = extrap("totalShares")
         ax.plot(rd3, yd3, **config.projstyle, color=config.colors.shares)
+        extrap_exp(ax, "totalShares", {"color": config.colors.shares})
 
-        ind = data["totalShares"][config.expstart : -1] > 0
-        days = data.Days[config.expstart : -1][ind]
-        val = data["totalShares"][config.expstart : -1][ind]
-        extrap_exp(ax, days, val, {"color": config.colors.shares})
-
-        ax.plot(data.Days, data["totalShares"], color=config.colors.shares, **config.dotstyle)
+        plot_dots(config, ax, win.days, win.full("totalShares"), color=config.colors.shares)
 
     if config.cash_bool:
-        ax.plot(data.Days, data["totalCash"], **config.dotstyle, color=config.colors.cash)
+        plot_dots(config, ax, data.Days, data["totalCash"], color=config.colors.cash)
 
     ############% LABELS
 
@@ -909,39 +1629,52 @@ def panel_all_vs_time(config, ax, data):
 
     #######%%###### EXTRAP
 
-    def extrap_target(yy):
-        if data.total.iat[-1] > 0.8 * yy:
-            return
-
-        reg = np.polyfit(data.Days[config.window_ind], data.total[config.window_ind], 1)
+    table = target_projection(config, win, ax.get_ylim()[1])
+    if not config.anon:
+        draw_targets(config, ax, table, win.days[-1])
+    return table
 
-        rr = (yy - reg[1]) / reg[0]
 
-        ax.plot((rr, rr, data.Days.iat[-1]), (0, yy, yy), "-", lw=config.linewidth, color=config.colors.target)
+def target_projection(config, win, ymax):
+    """
+    Time until the linear fit of the total reaches each of `config.linear_targets`.
 
-        ax.text(
-            data.Days.iat[-1] + (rr - data.Days.iat[-1]) / 2,
-            yy * 0.99,
-            f"{round(rr-data.Days.iat[-1],1)} yrs",
-            ha="center",
-            va="top",
-            color=config.colors.text,
-        )
-        ax.text(
-            data.Days.iat[-1] + (rr - data.Days.iat[-1]) / 2,
-            yy * 1.01,
-            int_to_dollars(config, yy),
-            ha="center",
-            va="bottom",
-            color=config.colors.text,
+    Returns
+    -------
+    DataFrame
+        One row per target with the `target` amount, the `day` it is reached
+        (in years since `config.since_yr`), the `years` from the last entry,
+        and whether it is `shown` on a plot with y-limit `ymax` (targets which
+        are nearly reached or off the plot are not).
+    """
+    targets = np.asarray(config.linear_targets, dtype=float)
+    days = win.crossing_times("total", targets)
+    shown = (targets < 0.85 * ymax) & ~(win.full("total")[-1] > 0.8 * targets)
+    return pd.DataFrame({"target": targets, "day": days, "years": days - win.days[-1], "shown": shown})
+
+
+def draw_targets(config, ax, table, last_day):
+    """Draw the guides of the shown targets as one LineCollection, each labelled with its amount above the years."""
+    rows = table[table.shown]
+    segments = [[(rr, 0), (rr, yy), (last_day, yy)] for yy, rr in zip(rows.target, rows.day)]
+    ax.add_collection(
+        LineCollection(
+            segments,
+            linewidths=config.linewidth,
+            colors=config.colors.target,
+            capstyle=mpl.rcParams["lines.solid_capstyle"],
+            joinstyle=mpl.rcParams["lines.solid_joinstyle"],
+            zorder=2,  # as for lines
         )
+    )
+    ax.autoscale_view()
 
-    if not config.anon:
-        for ii in config.linear_targets:
-            if ii < 0.85 * ax.get_ylim()[1]:
-                extrap_target(ii)
+    labels = [int_to_dollars(config, yy) + f"\n{round(years, 1)} yrs" for yy, years in zip(rows.target, rows.years)]
+    for xx, yy, label in zip(last_day + rows.years / 2, rows.target, labels):
+        ax.text(xx, yy, label, ha="center", va="center", linespacing=1.5, color=config.colors.text)
 
 
+@timed
 def panel_window(
         config, ax, data, name, col,
         xticklabels=False,
@@ -950,20 +1683,21 @@ def panel_window(
                 ):  # noqa: FBT002
     color_axes(config, ax)
 
+    win = window_view(config.window, data, config.window_ind)
+    days, vals = win.window("Days"), win.window(name)
+
     if extrap:
-        reg = np.polyfit(data.Days[config.window_ind], data[name][config.window_ind], 1)
-        rd = np.linspace(data.Days[config.window_ind].iat[0], data.Days.iat[-1])
-        yd = rd * reg[0] + reg[1]
+        slope, intercept = win.linear_fit(name)
+        rd = np.linspace(days[0], win.days[-1])
+        yd = rd * slope + intercept
         ax.plot(rd, yd, "-", lw=config.linewidth / 4, color=config.colors[col])
-    ax.plot(data.Days[config.window_ind], data[name][config.window_ind], color=config.colors[col], **config.dotstyle)
+    plot_dots(config, ax, days, vals, color=config.colors[col])
     
     if extrap:
-        logfit = np.polyfit(
-            data.Days[config.window_ind], np.log(data[name][config.window_ind]), 1, w=np.sqrt(data[name][config.window_ind])
-        )
-        rd = np.linspace(data.Days[config.window_ind].iat[0], data.Days.iat[-1])
-        yd = np.exp(logfit[1]) * np.exp(logfit[0] * rd)
-        infl = np.exp(logfit[0]) - 1
+        rate, logc = win.exp_fit(name)
+        rd = np.linspace(days[0], win.days[-1])
+        yd = np.exp(logc) * np.exp(rate * rd)
+        infl = win.growth(name)
         ax.plot(rd, yd, "--", lw=config.linewidth / 4, color=config.colors[col])
 
     y_min, y_max = ax.get_ylim()
@@ -976,8 +1710,8 @@ def panel_window(
     ax.grid(which="major", color=config.colors.grid, linestyle="-", linewidth=0.5)
     ax.grid(which="minor", color=config.colors.grid, linestyle="-", linewidth=0.5)
 
-    gain = data[name][config.window_ind].iat[-1] - data[name][config.window_ind].iat[0]
-    elap = data.Days[config.window_ind].iat[-1] - data.Days[config.window_ind].iat[0]
+    gain = vals[-1] - vals[0]
+    elap = days[-1] - days[0]
 
     if not xticklabels:
         ax.set_xticklabels([])
@@ -1016,25 +1750,31 @@ def panel_window(
         ax.set_ylabel("Amount", color=config.colors.text)
 
 
+@timed
 def panel_total_window(config, ax, data, xticklabels=True):  # noqa: FBT002
     panel_window(config, ax, data, "total", "total", xticklabels=xticklabels)
 
 
+@timed
 def panel_cash_window(config, ax, data, xticklabels=True):  # noqa: FBT002
     panel_window(config, ax, data, "totalCash", "cash", xticklabels=xticklabels, extrap=False)
 
 
+@timed
 def panel_shares_window(config, ax, data, xticklabels=True):  # noqa: FBT002
     panel_window(config, ax, data, "totalShares", "shares", xticklabels=xticklabels)
 
 
+@timed
 def panel_super_window(config, ax, data, xticklabels=True):  # noqa: FBT002
     panel_window(config, ax, data, "totalSuper", "super", xticklabels=xticklabels)
 
+@timed
 def panel_expend_window(config, ax, data, xticklabels=True, yzero=False):  # noqa: FBT002
     panel_window(config, ax, data, "totalExpend", "expend", xticklabels=xticklabels, extrap=False, yzero=yzero)
 
 
+@timed
 def panel_cash_window_percent(config, ax, data):
     color_axes(config, ax)
 
@@ -1043,10 +1783,11 @@ def panel_cash_window_percent(config, ax, data):
         ax.set_yticklabels([])
         return None
 
-    maxcash = max(data["totalCash"][config.window_ind])
+    win = window_view(config.window, data, config.window_ind)
+    maxcash = max(win.window("totalCash"))
     ax.plot(
-        data.Days[config.window_ind],
-        data["totalCash"][config.window_ind] / maxcash,
+        win.window("Days"),
+        win.window("totalCash") / maxcash,
         config.marker,
         linestyle="-",
         color=config.colors.cash,
@@ -1055,10 +1796,10 @@ def panel_cash_window_percent(config, ax, data):
     ax.set_ylim([-0.0, 1.1])
 
     for col in config.cash_cols:
-        maxcash = max(data[col][config.window_ind])
+        maxcash = max(win.window(col))
         ax.plot(
-            data.Days[config.window_ind],
-            data[col][config.window_ind] / maxcash,
+            win.window("Days"),
+            win.window(col) / maxcash,
             config.marker,
             linestyle="-",
             #            color=config.colors.cash,
@@ -1078,6 +1819,7 @@ def panel_cash_window_percent(config, ax, data):
     return None
 
 
+@timed
 def panel_shares_tot_exp(config, ax, ax33, data, data_sp):
     color_axes(config, ax)
 
@@ -1087,9 +1829,10 @@ def panel_shares_tot_exp(config, ax, ax33, data, data_sp):
         ax33.set_yticklabels([])
         return 0
 
+    win = window_view(config.window, data, config.window_ind)
     ax.plot(
-        data.Days[config.window_ind],
-        data["totalShares"][config.window_ind],
+        win.window("Days"),
+        win.window("totalShares"),
         config.marker,
         color=config.colors.shares,
         markersize=config.markersize,
@@ -1103,9 +1846,9 @@ def panel_shares_tot_exp(config, ax, ax33, data, data_sp):
     ax.grid(which="major", color=config.colors.grid, linestyle="-", linewidth=0.5)
     ax.grid(which="minor", color=config.colors.grid, linestyle="-", linewidth=0.5)
 
-    shares2 = pd.Series(data["totalShares"][config.window_ind]).reset_index(drop=True)
-    gain = shares2.iat[-1] - shares2.iat[0]
-    elap = data.Days[config.window_ind].iat[-1] - data.Days[config.window_ind].iat[0]
+    shares2 = win.window("totalShares")
+    gain = shares2[-1] - shares2[0]
+    elap = win.window("Days")[-1] - win.window("Days")[0]
 
     def label_graph_shares_a(ax):
         x_min, x_max = ax.get_xlim()
@@ -1128,7 +1871,7 @@ def panel_shares_tot_exp(config, ax, ax33, data, data_sp):
         if config.anon:
             txtstr = f"Bought =\n{pcgr:2.0f}% of growth"
         else:
-            val = sharebuy.iat[-1] - sharebuy.iat[0]
+            val = sharebuy[-1] - sharebuy[0]
             txtstr = "Bought " + int_to_dollars(config, val) + f"\n{pcgr:2.0f}% of growth"
         x_min, x_max = ax.get_xlim()
         y_min, y_max = ax.get_ylim()
@@ -1149,15 +1892,13 @@ def panel_shares_tot_exp(config, ax, ax33, data, data_sp):
         label_graph_shares_a(ax)
         return 0
 
-    sharesum = data_sp["totalExpend"].cumsum()
-    sharebuy = pd.Series(sharesum[config.win_sp_ind]).reset_index(drop=True)
-    bought = sharebuy.iat[-1] - sharebuy.iat[0]
-    profitloss = shares2.iat[-1] - sharebuy.iat[-1]
+    win_sp = window_view(config.win_sp, data_sp, config.win_sp_ind)
+    sharebuy = np.cumsum(win_sp.full("totalExpend"))[win_sp.mask]
+    bought = sharebuy[-1] - sharebuy[0]
+    profitloss = shares2[-1] - sharebuy[-1]
     pcgr = 100 * bought / gain
 
-    ax33.plot(
-        data_sp.Days[config.win_sp_ind], sharesum[config.win_sp_ind], **config.dotstyle, color=config.colors.expend
-    )
+    plot_dots(config, ax33, win_sp.window("Days"), sharebuy, color=config.colors.expend)
 
     yticks1 = ax.get_yticks()
     dy = yticks1[1] - yticks1[0]
@@ -1191,6 +1932,7 @@ def panel_shares_tot_exp(config, ax, ax33, data, data_sp):
     return profitloss
 
 
+@timed
 def panel_total_breakdown(config, data, ax):
     color_axes(config, ax)
 
@@ -1203,20 +1945,6 @@ def panel_total_breakdown(config, data, ax):
 
     pc_font = {"color": config.colors.contrast, "fontsize": 10, "rotation": 90, "va": "bottom"}
 
-    def get_total_totals(data, cols):
-        total = {}
-        for col in cols:
-            total[col] = list(data[col])[-1]
-        return total
-
-    def sankey_totals_makeup(data):
-        total_by_yr = {}
-        total_cols = ["totalShares", "totalSuper", "totalCash"]
-        for yr in config.years_uniq:
-            total_by_yr[f"f{yr}"] = total_cols
-            total_by_yr[yr] = get_total_totals(data[data["Year"] == yr], total_cols).values()
-        return pd.DataFrame(total_by_yr)
-
     ldict = {
         "totalCash": "Cash",
         "totalShares": "Shares",
@@ -1230,7 +1958,7 @@ def panel_total_breakdown(config, data, ax):
 
     sky.sankey(
         ax=ax,
-        data=sankey_totals_makeup(data),
+        data=sankey_makeup(config, data, ["totalShares", "totalSuper", "totalCash"], "last"),
         titles=[yrlbl(i) for i in config.years_uniq],
         colormap=config.sankey_colormaps[2],
         color_dict=cdict,
@@ -1274,6 +2002,7 @@ def panel_total_breakdown(config, data, ax):
 ############## PANEL 4: Total Window
 
 
+@timed
 def panel_income_breakdown(config, data, ax):
     color_axes(config, ax)
 
@@ -1286,14 +2015,7 @@ def panel_income_breakdown(config, data, ax):
 
     pc_font = {"color": config.colors.contrast, "fontsize": 10, "rotation": 90, "va": "bottom"}
 
-    def sankey_income(data, income_cols):
-        total_by_yr = {}
-        for yr in config.years_uniq:
-            total_by_yr[f"f{yr}"] = income_cols
-            total_by_yr[yr] = get_inc_totals(data[data["Year"] == yr], income_cols).values()
-        return pd.DataFrame(total_by_yr)
-
-    ssdata = sankey_income(data, config.income_minor)
+    ssdata = sankey_income(config, data, config.income_minor)
     sdata = ssdata.iloc[:, -2:]
     sdata = sdata.set_index(sdata.columns[0])
     ssort = sdata.to_dict(orient="dict")
@@ -1340,6 +2062,7 @@ def panel_income_breakdown(config, data, ax):
 ############## PANEL 5: Shares Breakdown
 
 
+@timed
 def panel_shares_breakdown(config, data, ax):
     color_axes(config, ax)
 
@@ -1352,22 +2075,9 @@ def panel_shares_breakdown(config, data, ax):
 
     pc_font = {"color": config.colors.contrast, "fontsize": 10, "rotation": 90, "va": "bottom"}
 
-    def get_shares_totals(data, cols):
-        total = {}
-        for col in cols:
-            total[col] = list(data[col])[-1]
-        return total
-
-    def sankey_shares_makeup(data):
-        total_by_yr = {}
-        for yr in config.years_uniq:
-            total_by_yr[f"f{yr}"] = config.shares_cols
-            total_by_yr[yr] = get_shares_totals(data[data["Year"] == yr], config.shares_cols).values()
-        return pd.DataFrame(total_by_yr)
-
     sky.sankey(
         ax=ax,
-        data=sankey_shares_makeup(data),
+        data=sankey_makeup(config, data, config.shares_cols, "last"),
         titles=[yrlbl(i) for i in config.years_uniq],
         colormap=config.sankey_colormaps[2],
         sort=config.sankey_sort,
@@ -1406,6 +2116,7 @@ def panel_shares_breakdown(config, data, ax):
         ax.set_yticklabels([])
 
 
+@timed
 def panel_super_breakdown(config, data, ax):
     color_axes(config, ax)
 
@@ -1418,22 +2129,9 @@ def panel_super_breakdown(config, data, ax):
 
     pc_font = {"color": config.colors.contrast, "fontsize": 10, "rotation": 90, "va": "bottom"}
 
-    def get_super_totals(data, cols):
-        total = {}
-        for col in cols:
-            total[col] = list(data[col])[-1]
-        return total
-
-    def sankey_super_makeup(data):
-        total_by_yr = {}
-        for yr in config.years_uniq:
-            total_by_yr[f"f{yr}"] = config.super_cols
-            total_by_yr[yr] = get_super_totals(data[data["Year"] == yr], config.super_cols).values()
-        return pd.DataFrame(total_by_yr)
-
     sky.sankey(
         ax=ax,
-        data=sankey_super_makeup(data),
+        data=sankey_makeup(config, data, config.super_cols, "last"),
         titles=[yrlbl(i) for i in config.years_uniq],
         colormap=config.sankey_colormaps[2],
         sort=config.sankey_sort,
@@ -1472,6 +2170,7 @@ def panel_super_breakdown(config, data, ax):
         ax.set_yticklabels([])
 
 
+@timed
 def panel_cash_breakdown(config, data, ax):
     color_axes(config, ax)
 
@@ -1484,22 +2183,9 @@ def panel_cash_breakdown(config, data, ax):
 
     pc_font = {"color": config.colors.contrast, "fontsize": 10, "rotation": 90, "va": "bottom"}
 
-    def get_cash_totals(data, cols):
-        total = {}
-        for col in cols:
-            total[col] = list(data[col])[-1]
-        return total
-
-    def sankey_cash_makeup(data):
-        total_by_yr = {}
-        for yr in config.years_uniq:
-            total_by_yr[f"f{yr}"] = config.cash_cols
-            total_by_yr[yr] = get_cash_totals(data[data["Year"] == yr], config.cash_cols).values()
-        return pd.DataFrame(total_by_yr)
-
     sky.sankey(
         ax=ax,
-        data=sankey_cash_makeup(data),
+        data=sankey_makeup(config, data, config.cash_cols, "last"),
         titles=[yrlbl(i) for i in config.years_uniq],
         colormap=config.sankey_colormaps[2],
         sort="none",
@@ -1537,6 +2223,7 @@ def panel_cash_breakdown(config, data, ax):
         ax.set_yticklabels([])
 
 
+@timed
 def panel_income(config, ax4, alldata, xticklabels=False):  # noqa: FBT002
     color_axes(config, ax4)
 
@@ -1592,6 +2279,7 @@ def panel_income(config, ax4, alldata, xticklabels=False):  # noqa: FBT002
 ################################
 
 
+@timed
 def panel_income_window(config, ax, data, xticklabels=True, thresh=None):  # noqa: FBT002
     if thresh is None:
         thresh = [0, 999999]
@@ -1653,6 +2341,7 @@ def panel_income_window(config, ax, data, xticklabels=True, thresh=None):  # noq
 
 ################################
 
+@timed
 def panel_cash_window_detail(config, ax, data, xticklabels=True, thresh=None):  # noqa: FBT002
     if thresh is None:
         thresh = [0, 999999]
@@ -1720,6 +2409,7 @@ def panel_cash_window_detail(config, ax, data, xticklabels=True, thresh=None):
         ax.set_yticklabels([])
         ax.set_ylabel("Amount", color=config.colors.text)
 
+@timed
 def panel_expend_share_detail(config, ax, data, name, xticklabels=True, legend="", cumsum=False, yzero=True, grid=True):  # noqa: FBT002
 
     color_axes(config, ax)
@@ -1764,6 +2454,7 @@ def panel_expend_share_detail(config, ax, data, name, xticklabels=True, legend="
 
 ################################
 
+@timed
 def panel_shares(config, ax, alldata):
     color_axes(config, ax)
 
@@ -1834,48 +2525,156 @@ def yrlbl(yr):
     return "'" + yrstr[2:4]
 
 
+def plot_dots(config, ax, x, y, **kwargs):
+    """
+    Plot a series as dots (`config.dotstyle`), decimated with `config.decimate`
+    to the pixel width of `ax` and rasterized if longer than `config.rasterize_dots`.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if config.decimate is not None:
+        ind = decimate_indices(x, y, max(int(ax.get_window_extent().width), 1), config.decimate)
+        x, y = x[ind], y[ind]
+    rasterized = config.rasterize_dots is not None and len(x) > config.rasterize_dots
+    return ax.plot(x, y, **config.dotstyle, rasterized=rasterized, **kwargs)
+
+
+def decimate_indices(x, y, nbins, method="minmax"):
+    """
+    Return the indices (in order) of about `2 * nbins` points of a series that
+    look the same as the whole series when plotted `nbins` pixels wide.
+
+    Points that are not finite are dropped (they are not plotted anyway), and
+    the first and last points are always kept.
+
+    Parameters
+    ----------
+    x, y : array
+    nbins : int
+        Number of buckets along `x`, usually the pixel width of the axes.
+    method : str
+        `"minmax"` keeps the points with the lowest and highest `y` in each
+        bucket. `"lttb"` keeps the one point of each of `2 * nbins` buckets
+        that forms the largest triangle with the points kept either side.
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    idx = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if method not in ("minmax", "lttb"):
+        error_msg = f"Unknown decimation method '{method}', use 'minmax' or 'lttb'."
+        raise ValueError(error_msg)
+    if len(idx) <= 2 * nbins:
+        return idx
+    idx = idx[np.argsort(x[idx], kind="stable")]
+    xs, ys = x[idx], y[idx]
+    keep = _minmax_keep(xs, ys, nbins) if method == "minmax" else _lttb_keep(xs, ys, 2 * nbins)
+    return np.sort(idx[keep])
+
+
+def _minmax_keep(xs, ys, nbins):
+    span = xs[-1] - xs[0]
+    bins = np.zeros(len(xs), dtype=int) if span == 0 else np.minimum(((xs - xs[0]) / span * nbins).astype(int), nbins - 1)
+    # sorted by bucket then y, so the first and last of each bucket are its min and max
+    order = np.lexsort((ys, bins))
+    first = np.flatnonzero(np.r_[True, bins[order][1:] != bins[order][:-1]])
+    last = np.r_[first[1:], len(order)] - 1
+    return np.unique(np.r_[0, order[first], order[last], len(xs) - 1])
+
+
+def _lttb_keep(xs, ys, nout):
+    # the first and last points are kept, the others are split into nout - 2 buckets
+    edges = np.linspace(1, len(xs) - 1, nout - 1).astype(int)
+    keep = np.zeros(nout, dtype=int)
+    keep[-1] = len(xs) - 1
+    prev = 0
+    for ii in range(nout - 2):
+        lo, hi = edges[ii], edges[ii + 1]
+        if ii < nout - 3:
+            avgx, avgy = xs[hi : edges[ii + 2]].mean(), ys[hi : edges[ii + 2]].mean()
+        else:
+            avgx, avgy = xs[-1], ys[-1]
+        area = np.abs((xs[prev] - avgx) * (ys[lo:hi] - ys[prev]) - (xs[prev] - xs[lo:hi]) * (avgy - ys[prev]))
+        prev = lo + int(np.argmax(area))
+        keep[ii + 1] = prev
+    return keep
+
+
 def yticks_dollars(config, ax):
+    """
+    Label the y ticks of `ax` as dollar amounts.
+
+    The limits are widened to the outer ticks, but the ticks are not fixed:
+    they follow any later change of the limits and are labelled when drawn.
+    """
     ticks = ax.get_yticks()
-    ax.set_yticks(ticks)
-    newticks = [int_to_dollars(config, int(tick)) for tick in ticks]
-    ax.set_yticklabels(newticks)
+    ax.yaxis.set_view_interval(min(ticks), max(ticks))
+    ax.yaxis.set_major_formatter(DollarFormatter(config))
+
+
+class DollarFormatter(Formatter):
+    """
+    Matplotlib tick formatter for dollar amounts, see `int_to_dollars()`.
+
+    Only the ticks within the axis limits are formatted, at draw time, and
+    together with `dollars_array()`.
+    """
+
+    def __init__(self, config):
+        # not the config itself, so that figures can still be pickled
+        self.currencysign = config.currencysign
+
+    def __call__(self, x, pos=None):  # noqa: ARG002
+        return _dollars(self.currencysign, int(x), 0)
+
+    def format_ticks(self, values):
+        # as __call__ for each tick, but formatted together
+        return _dollar_labels(self.currencysign, np.trunc(values), 0)
 
 
 def int_to_dollars(config, xx, plussig=0):
+    """Format an amount as e.g. "$950", "$1.2k", "$15k", "-$1.25M" (memoised)."""
+    return _dollars(config.currencysign, xx, plussig)
+
+
+@lru_cache(maxsize=4096)
+def _dollars(currencysign, xx, plussig):
     x = abs(round(xx))
+    band = bisect_right(_DOLLAR_BOUNDS, x)
     sgn = "-" if xx < 0 else ""
-    amt_k = 1_000
-    amt_m = 1_000_000
-    amt_b = 1_000_000_000
-    if x < amt_k:
-        div = 1
-        suffix = ""
-        sig = 0
-    elif x >= amt_k and x < 10 * amt_k:
-        div = amt_k
-        suffix = "k"
-        sig = 1
-    elif x >= 10 * amt_k and x < amt_m:
-        div = amt_k
-        suffix = "k"
-        sig = 0
-    elif x >= amt_m and x < 10 * amt_m:
-        div = amt_m
-        suffix = "M"
-        sig = 2
-    elif x >= 10 * amt_m and x < amt_b:
-        div = amt_m
-        suffix = "M"
-        sig = 1
-    elif x >= amt_b and x < 10 * amt_b:
-        div = amt_b
-        suffix = "B"
-        sig = 2
-    else:
-        div = amt_b
-        suffix = "B"
-        sig = 1
-    return sgn + config.currencysign + f"{ x / div :.{sig+plussig}f}" + suffix
+    return sgn + currencysign + f"{ x / _DOLLAR_DIVS[band] :.{_DOLLAR_SIGS[band] + plussig}f}" + _DOLLAR_SUFFIXES[band]
+
+
+# amounts from each bound (up to the next) are divided, rounded to the
+# number of decimals and suffixed as in the matching entries below
+_DOLLAR_BOUNDS = (1_000, 10_000, 1_000_000, 10_000_000, 1_000_000_000, 10_000_000_000)
+_DOLLAR_DIVS = (1, 1_000, 1_000, 1_000_000, 1_000_000, 1_000_000_000, 1_000_000_000)
+_DOLLAR_SIGS = (0, 1, 0, 2, 1, 2, 1)
+_DOLLAR_SUFFIXES = ("", "k", "k", "M", "M", "B", "B")
+
+
+def _dollar_scale(values):
+    """
+    Return the rounded magnitude of each amount in its unit, the usual number
+    of decimals, and the index of the unit (in `_DOLLAR_SUFFIXES`).
+    """
+    x = np.abs(np.round(values))
+    band = np.searchsorted(_DOLLAR_BOUNDS, x, side="right")
+    return x / np.array(_DOLLAR_DIVS)[band], np.array(_DOLLAR_SIGS)[band], band
+
+
+def dollars_array(config, values, plussig=0):
+    """Format an array of amounts as `int_to_dollars()` does, returning a list of str."""
+    return _dollar_labels(config.currencysign, values, plussig)
+
+
+def _dollar_labels(currencysign, values, plussig):
+    vals = np.asarray(values, dtype=float)
+    scaled, sig, band = _dollar_scale(vals)
+    sig = sig + plussig
+    nums = np.zeros(len(vals), dtype="U32")
+    for ss in np.unique(sig):
+        ind = sig == ss
+        nums[ind] = np.char.mod(f"%.{ss}f", scaled[ind])
+    labels = np.char.add(np.where(vals < 0, "-" + currencysign, currencysign), nums)
+    return np.char.add(labels, np.array(_DOLLAR_SUFFIXES)[band]).tolist()
 
 
 def yticks_equalise(config, ax4, ax5):
@@ -1889,7 +2688,7 @@ def yticks_equalise(config, ax4, ax5):
 
 
 def faux_title(config, ax, txtstr):
-    xrange = np.diff(ax.get_xlim())
+    xrange = np.diff(ax.get_xlim())[0]
     ax.text(
         ax.get_xlim()[0] + 0.04 * xrange,
         0.95 * ax.get_ylim()[1],
@@ -1904,35 +2703,69 @@ def faux_title(config, ax, txtstr):
 ############## SANKEY SETUP
 
 
-def get_totals(data, val, spend):
-    shares = data[data[val] > 0]
-    total = {}
-    total["Bought"] = sum(data[spend])
-    total["Growth"] = max(shares[val]) - min(shares[val]) - sum(data[spend])
-    return total
-
+def year_summary(config, data):
+    """
+    Per-year aggregates of every numeric column of `data`, shared by the Sankey panels.
 
-def sankey_shares(config, data):
+    Columns are a MultiIndex of (column, statistic) for the statistics
+    "sum", "first", "last", "min", "max", and "posmin" (the minimum of the
+    positive values only). Computed with a single groupby and reused for as
+    long as the same `data` object is passed in.
+    """
+    key = id(data)
+    ref, summary = config.year_summaries.get(key, (None, None))
+    if ref is not None and ref() is data:
+        return summary
+
+    numdata = data.select_dtypes("number").drop(columns="Year").astype(float)
+    grouped = numdata.groupby(data["Year"])
+    posmin = numdata.where(numdata > 0).groupby(data["Year"]).min()
+    summary = pd.concat(
+        [
+            grouped.sum(),
+            grouped.first(),
+            grouped.last(),
+            grouped.min(),
+            grouped.max(),
+            posmin,
+        ],
+        axis=1,
+        keys=["sum", "first", "last", "min", "max", "posmin"],
+    ).swaplevel(axis=1)
+
+    config.year_summaries[key] = (weakref.ref(data), summary)
+    return summary
+
+
+def year_table(config, data, cols, stat):
+    """Return a (years x cols) frame of one statistic for the years shown."""
+    summary = year_summary(config, data)
+    table = summary.xs(stat, axis=1, level=1)
+    return table.loc[list(config.years_uniq), cols]
+
+
+def sankey_frame(config, table):
     total_by_yr = {}
     for yr in config.years_uniq:
-        total_by_yr[f"f{yr}"] = ["Bought", "Growth"]
-        total_by_yr[yr] = get_totals(data[data["Year"] == yr], "totalShares", "totalExpend").values()
+        total_by_yr[f"f{yr}"] = list(table.columns)
+        total_by_yr[yr] = list(table.loc[yr])
     return pd.DataFrame(total_by_yr)
 
 
-def sankey_income(config, data, income_cols):
-    total_by_yr = {}
-    for yr in config.years_uniq:
-        total_by_yr[f"f{yr}"] = income_cols
-        total_by_yr[yr] = get_inc_totals(data[data["Year"] == yr], income_cols).values()
-    return pd.DataFrame(total_by_yr)
+def sankey_makeup(config, data, cols, stat):
+    return sankey_frame(config, year_table(config, data, cols, stat))
 
 
-def get_inc_totals(data, income_cols):
-    total = {}
-    for col in income_cols:
-        total[col] = sum(data[col])
-    return total
+def sankey_shares(config, data):
+    bought = year_table(config, data, ["totalExpend"], "sum")["totalExpend"]
+    smax = year_table(config, data, ["totalShares"], "max")["totalShares"]
+    smin = year_table(config, data, ["totalShares"], "posmin")["totalShares"]
+    table = pd.DataFrame({"Bought": bought, "Growth": smax - smin - bought})
+    return sankey_frame(config, table)
+
+
+def sankey_income(config, data, income_cols):
+    return sankey_makeup(config, data, income_cols, "sum")
 
 
 ################################
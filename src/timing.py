@@ -0,0 +1,109 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+logger = logging.getLogger("networthdash")
+
+
+class Spans:
+    """
+    Nested, named timing spans of one `dashboard()` run.
+
+    Each span is recorded with its path (the names of the enclosing spans
+    joined by "/"), so that e.g. "main7/panel_total_window/panel_window" is
+    included in the time of "main7/panel_total_window".
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.records = []
+        self.stack = []
+
+    @contextmanager
+    def span(self, name):
+        self.stack.append(name)
+        record = {"name": "/".join(self.stack), "depth": len(self.stack) - 1}
+        self.records.append(record)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self.stack.pop()
+
+    def report(self):
+        return {"seconds": time.perf_counter() - self.start, "spans": self.records}
+
+
+def format_report(report):
+    """Return the timing report as an indented table, one span per line."""
+    lines = [f"{report['seconds']:8.3f}s  dashboard"]
+    for record in report["spans"]:
+        name = record["name"].rsplit("/", 1)[-1]
+        lines.append(f"{record['seconds']:8.3f}s  {'  ' * (record['depth'] + 1)}{name}")
+    if report.get("profile"):
+        lines.append(report["profile"])
+    return "\n".join(lines)
+
+
+@contextmanager
+def span(config, name):
+    """Time the enclosed block as `name` if `config.timing` is enabled for the current dashboard."""
+    spans = getattr(config, "spans", None)
+    if spans is None:
+        yield
+    else:
+        with spans.span(name):
+            yield
+
+
+def timed(func):
+    """Record each call of a panel function (which takes `config` first) as a span."""
+
+    @wraps(func)
+    def wrapper(config, *args, **kwargs):
+        with span(config, func.__name__):
+            return func(config, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def instrument(config):
+    """
+    Collect the timing spans (and profile) of a dashboard run into `config.timing_report`.
+
+    The report is a dict with the total `seconds`, the list of `spans` and,
+    with `config.profile`, the `profile` as text (the functions with the most
+    cumulative time). It is also logged at INFO level to the "networthdash" logger.
+    """
+    if not (config.timing or config.profile):
+        config.spans = None
+        yield
+        return
+
+    config.spans = Spans()
+    profiler = cProfile.Profile() if config.profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        report = config.spans.report()
+        report["profile"] = None
+        if profiler is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+            stats.print_stats(30)
+            report["profile"] = stream.getvalue()
+            if isinstance(config.profile, str):
+                stats.dump_stats(config.profile)
+        config.spans = None
+        config.timing_report = report
+        logger.info("dashboard timings:\n%s", format_report(report))
@@ -0,0 +1,224 @@
+import argparse
+import hashlib
+import os
+import sys
+import time
+import traceback
+from dataclasses import replace
+
+import pandas as pd
+
+from . import cache
+from .config import Config
+from .main import (
+    LAYOUTS,
+    append_ledger,
+    build_ledger,
+    dashboard,
+    extra_columns,
+    prepare_config,
+)
+
+
+def layout_inputs(config, name):
+    """
+    Return the ledger columns that the layout `name` is drawn from.
+
+    Every layout uses the dates, and all but `income4` use the totals (at
+    least to select the rows with a positive net worth). `share4` also uses
+    the "Fund" column of `config.share_focus`.
+    """
+    dates = [config.strings.datecol, "Year", "Days"]
+    if name == "income4":
+        return [*dates, *config.income_cols]
+    balances = [*config.super_cols, *config.shares_cols, *config.cash_cols]
+    if name == "cash4":
+        return [*dates, *balances, *config.expend_cols]
+    if name == "share4":
+        return [*dates, *balances, *config.expend_cols, *config.income_cols, *extra_columns(config)]
+    return [*dates, *balances, *config.expend_cols, *config.income_cols]
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Watcher:
+    """
+    Keep the ledger of a CSV file in memory and re-render its dashboards when it changes.
+
+    Rows appended to the file are processed incrementally (as with the on-disk
+    cache); any other change re-reads the whole file. After each update only
+    the layouts whose input columns (see `layout_inputs()`) changed are
+    rendered again.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.path = config.csvdir + config.csv
+        self.since_yr = config.since_yr  # as given by the user
+        self.alldata = None
+        self.csv_state = None
+        self.fingerprints = {}
+        prepare_config(config)
+
+    def _ingest(self):
+        """Bring `self.alldata` up to date with the file, returning False if it had not changed."""
+        config = self.config
+        state = self.csv_state
+        if state is not None and state["eol"]:
+            prefix, digest, tail = cache.read_appended(self.path, state["size"])
+            if prefix == state["hash"]:
+                if not tail:
+                    return False
+                alldata = append_ledger(config, self.alldata, tail, since_yr=self.since_yr)
+                if alldata is not None:
+                    self.alldata = alldata
+                    self.csv_state = {"size": state["size"] + len(tail), "hash": digest, "eol": tail.endswith(b"\n")}
+                    return True
+
+        _, digest, raw = cache.read_appended(self.path)
+        if state is not None and digest == state["hash"]:
+            return False
+        config.since_yr = self.since_yr
+        self.alldata = build_ledger(config, raw)
+        self.csv_state = {"size": len(raw), "hash": digest, "eol": raw.endswith(b"\n")}
+        return True
+
+    def _fingerprint(self, name):
+        cols = layout_inputs(self.config, name)
+        hashes = pd.util.hash_pandas_object(self.alldata[cols], index=False)
+        return hashlib.sha256(hashes.to_numpy().tobytes() + repr(cols).encode()).hexdigest()
+
+    def update(self):
+        """
+        Re-read the CSV file and render the layouts whose inputs changed.
+
+        Returns
+        -------
+        dict
+            The Figure of each layout rendered, keyed by layout name (empty if
+            nothing changed).
+        """
+        if not self._ingest():
+            return {}
+
+        requested = [self.config.layout] if isinstance(self.config.layout, str) else self.config.layout
+        changed = []
+        for name in (name for name in LAYOUTS if name in requested):
+            fingerprint = self._fingerprint(name)
+            if self.fingerprints.get(name) != fingerprint:
+                self.fingerprints[name] = fingerprint
+                changed.append(name)
+        if not changed:
+            return {}
+
+        return dashboard(replace(self.config, layout=changed), self.alldata)
+
+
+def watch(config, interval=1.0, debounce=0.5, max_updates=None, on_update=None):
+    """
+    Render the dashboards of `config` and re-render them whenever the CSV file changes.
+
+    The file is polled every `interval` seconds, and a change is only acted
+    on once the file has been left unchanged for `debounce` seconds (so that
+    a save in progress is not read). Use `config.headless` so that rendering
+    does not wait on `plt.show()`. Errors while updating (e.g., from a
+    half-edited file) are printed and the file is watched again.
+
+    Parameters
+    ----------
+    config : Config
+    interval : float
+        Seconds between checks of the file's modification time and size.
+    debounce : float
+        Seconds the file must be unchanged before it is read.
+    max_updates : int
+        Return after this many updates (including the first render); by
+        default watch until interrupted.
+    on_update : callable
+        Called with the dict of Figures rendered by each update.
+    """
+    watcher = Watcher(config)
+    updates = 0
+    seen = None
+    try:
+        while max_updates is None or updates < max_updates:
+            sig = _stat(watcher.path)
+            if sig is None or sig == seen:
+                time.sleep(interval)
+                continue
+            if seen is not None:
+                while True:
+                    time.sleep(debounce)
+                    new = _stat(watcher.path)
+                    if new == sig:
+                        break
+                    sig = new
+            seen = sig
+
+            try:
+                figs = watcher.update()
+            except Exception:  # noqa: BLE001
+                print(traceback.format_exc(), file=sys.stderr)  # noqa: T201
+                continue
+            updates += 1
+            if on_update is not None:
+                on_update(figs)
+    except KeyboardInterrupt:
+        pass
+    return watcher
+
+
+def main(argv=None):
+    """
+    Command line interface for watch mode, e.g.:
+
+        python -m networthdash.src.watch ledger.csv --born-yr 1981 --png
+    """
+    parser = argparse.ArgumentParser(description="Re-create net worth dashboards whenever the CSV file changes.")
+    parser.add_argument("csv", help="CSV file to watch")
+    parser.add_argument("--born-yr", type=int, required=True)
+    parser.add_argument("--retire-age", type=int, default=Config.retire_age)
+    parser.add_argument("--datefmt", default=Config.datefmt)
+    parser.add_argument("--layout", action="append", help="may be given more than once (default: main7)")
+    parser.add_argument("--savedir", default=Config.savedir)
+    parser.add_argument("--pdf", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--png", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--jpg", action=argparse.BooleanOptionalAction, default=False)
+    parser.add_argument("--anon", action="store_true")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between checks of the file")
+    parser.add_argument("--debounce", type=float, default=0.5, help="seconds the file must be unchanged")
+    args = parser.parse_args(argv)
+
+    csvdir, csv = os.path.split(args.csv)
+    config = Config(
+        csvdir=(csvdir or ".") + "/",
+        csv=csv,
+        born_yr=args.born_yr,
+        retire_age=args.retire_age,
+        datefmt=args.datefmt,
+        layout=args.layout or Config.layout,
+        savedir=args.savedir,
+        savepdf=args.pdf,
+        savepng=args.png,
+        savejpg=args.jpg,
+        anon=args.anon,
+        headless=True,
+        reuse_figures=True,
+    )
+
+    def report(figs):
+        stamp = time.strftime("%H:%M:%S")
+        print(f"{stamp} rendered: {', '.join(figs) or '(no changes)'}")  # noqa: T201
+
+    watch(config, interval=args.interval, debounce=args.debounce, on_update=report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
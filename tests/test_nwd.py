@@ -1,3 +1,9 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
 import pytest
 
 import src as nwd
@@ -33,3 +39,556 @@ def test_simple(csvname, anon):
         anon=anon,
     )
     nwd.dashboard(cfg)
+
+
+def test_expr_columns():
+    from src.main import expend_price, expr_columns, expr_expend_columns
+
+    data = pd.DataFrame(
+        {
+            "cash": ["20 x 4 + 10", "$5", 0, "-3"],
+            "expend": ["10 x 2.5", "7", 0, "-2 x 3"],
+        }
+    )
+    assert list(expr_columns(data, ["cash"])["cash"]) == [90, 5, 0, -3]
+    expend = expr_expend_columns(data, ["expend"])
+    assert list(expend["expend"]) == [25, 7, 0, -6]
+    assert list(expend["expend_count"]) == [10, 0, 0, -2]
+    assert list(expend_price(expend, "expend")) == [2.5, 0, 0, 3]
+
+
+def test_read_ledger_sources():
+    import io
+
+    from src.main import read_ledger
+
+    fname = std["csvdir"] + "nwd_example.csv"
+    cfg = nwd.Config(**std)
+    cfg, ref = read_ledger(cfg, fname)
+    with open(fname, "rb") as f:
+        _, from_handle = read_ledger(nwd.Config(**std), f)
+        assert not f.closed
+    with open(fname, "rb") as f:
+        _, from_buffer = read_ledger(nwd.Config(**std), io.BytesIO(f.read()))
+
+    assert cfg.shares_cols == ["Shares_VAS", "Shares_VGS"]
+    assert ref.equals(from_handle)
+    assert ref.equals(from_buffer)
+
+
+def test_cache(tmp_path, monkeypatch):
+    import os
+    import shutil
+
+    from src import cache
+    from src.cache import cache_key, read_appended
+    from src.main import build_ledger, load_ledger
+
+    shutil.copy(std["csvdir"] + "nwd_example.csv", tmp_path)
+    opts = std | {"csvdir": str(tmp_path) + "/", "csv": "nwd_example.csv", "cache": True}
+
+    ref = build_ledger(nwd.Config(**opts))
+    first = load_ledger(nwd.Config(**opts))
+    assert (tmp_path / "nwd_example.csv.nwdcache.npz").exists()
+    cfg = nwd.Config(**opts)
+    second = load_ledger(cfg)
+
+    pd.testing.assert_frame_equal(ref, first)
+    pd.testing.assert_frame_equal(ref, second)
+    assert cfg.since_yr == 2022
+    assert cfg.shares_cols == ["Shares_VAS", "Shares_VGS"]
+
+    # a ledger read in chunks only has some of the columns, so is cached apart
+    chunked = nwd.Config(**opts, chunksize=5)
+    assert cache_key(chunked) != cache_key(nwd.Config(**opts))
+    focused = nwd.Config(**opts, chunksize=5)
+    focused.share_focus = {"expend_col": "BuyShares", "fund": "VAS"}
+    assert cache_key(focused) != cache_key(chunked)
+
+    # an unchanged file is not hashed once its stat is recorded
+    csvfile = tmp_path / "nwd_example.csv"
+    old = csvfile.stat().st_mtime_ns - 10**10
+    os.utime(csvfile, ns=(old, old))
+    load_ledger(nwd.Config(**opts))
+    hashed = []
+    monkeypatch.setattr(cache, "read_appended", lambda *args: hashed.append(args) or read_appended(*args))
+    pd.testing.assert_frame_equal(ref, load_ledger(nwd.Config(**opts)))
+    assert hashed == []
+    csvfile.write_text(csvfile.read_text().replace("2022-", "2023-", 1))
+    os.utime(csvfile, ns=(old + 1, old + 1))
+    assert load_ledger(nwd.Config(**opts))["Date"].iat[0] > ref["Date"].iat[0]
+    assert hashed
+
+
+def test_csv_bom(tmp_path):
+    from src.main import build_ledger, prepare_config
+
+    # a byte order mark before a first column which is not the date column
+    rows = [line.split(",") for line in Path(std["csvdir"], "nwd_example.csv").read_text().splitlines()]
+    text = "\n".join(",".join([row[1], row[0], *row[2:]]) for row in rows) + "\n"
+    (tmp_path / "bom.csv").write_text("\ufeff" + text, encoding="utf-8")
+    for source in [None, (tmp_path / "bom.csv").read_bytes()]:
+        cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/", "csv": "bom.csv"})
+        prepare_config(cfg)
+        alldata = build_ledger(cfg, source)
+        assert cfg.shares_cols == ["Shares_VAS", "Shares_VGS"]
+        assert alldata["Shares_VAS"].iat[0] > 0
+
+
+def test_cache_append(tmp_path):
+    from src.main import build_ledger, load_ledger
+
+    lines = [line + "\n" for line in Path(std["csvdir"], "nwd_example.csv").read_text().splitlines()]
+    csvfile = tmp_path / "nwd_example.csv"
+    opts = std | {"csvdir": str(tmp_path) + "/", "csv": "nwd_example.csv", "cache": True}
+
+    csvfile.write_text("".join(lines[:20]))
+    load_ledger(nwd.Config(**opts))
+
+    # appended rows only
+    csvfile.write_text("".join(lines))
+    appended = load_ledger(nwd.Config(**opts))
+    pd.testing.assert_frame_equal(build_ledger(nwd.Config(**opts)), appended)
+
+    # edits to earlier rows
+    csvfile.write_text("".join(lines[:2] + lines[3:] + lines[2:3]))
+    edited = load_ledger(nwd.Config(**opts))
+    pd.testing.assert_frame_equal(build_ledger(nwd.Config(**opts)), edited)
+
+
+def test_parallel_layouts(tmp_path):
+    cfg = nwd.Config(
+        **std | {"savepdf": True, "savepng": True},
+        csv="nwd_example.csv",
+        layout=["main7", "cash4", "income4"],
+        savedir=str(tmp_path) + "/",
+        workers=3,
+    )
+    figs = nwd.dashboard(cfg)
+    assert list(figs) == ["main7", "income4", "cash4"]
+    assert len(list(tmp_path.glob("*.pdf"))) == 3
+
+
+def test_batch():
+    from src.batch import batch, configs_from_glob
+
+    configs = configs_from_glob(std["csvdir"] + "nwd_example.csv", **std)
+    configs.append(nwd.Config(**std, csv="missing.csv"))
+    results = batch(configs)
+
+    assert [res.ok for res in results] == [True, True, False]
+    assert results[0].ingest_seconds > 0
+    assert results[1].ingest_seconds == 0
+    assert "FileNotFoundError" in results[2].error
+
+
+def test_batch_cli_headless(monkeypatch):
+    from src import batch
+
+    seen = []
+    monkeypatch.setattr(batch, "batch", lambda configs, workers: seen.extend(configs) or [])
+    batch.main([std["csvdir"] + "nwd_example.csv", "--born-yr", "1981", "--workers", "1"])
+    # run in this process, the dashboards must not wait on plt.show()
+    assert len(seen) == 2
+    assert all(config.headless for config in seen)
+
+
+def test_headless(tmp_path):
+    cfg = nwd.Config(
+        **std | {"savepng": True},
+        csv="nwd_example.csv",
+        layout=["main7", "plain8", "income4", "cash4", "ipad_1"],
+        savedir=str(tmp_path) + "/",
+        headless=True,
+    )
+    figs = nwd.dashboard(cfg)
+    assert list(figs) == ["main7", "plain8", "income4", "cash4", "ipad_1"]
+    assert len(list(tmp_path.glob("*.png"))) == 5
+    assert set(cfg.save_timings["main7"]) == {"draw", "png"}
+
+
+def test_render_dashboard():
+    cfg = nwd.Config(**std | {"savepdf": True}, csv="nwd_example.csv", savedir="/nonexistent/")
+    out = nwd.render_dashboard(cfg, formats=["png", "jpg", "pdf", "svg"])
+    assert out["main7"]["png"].startswith(b"\x89PNG")
+    assert out["main7"]["jpg"].startswith(b"\xff\xd8")
+    assert out["main7"]["pdf"].startswith(b"%PDF")
+    assert b"<svg" in out["main7"]["svg"]
+
+
+def test_render_jpg_background():
+    from io import BytesIO
+
+    import matplotlib as mpl
+    import matplotlib.pyplot as plt
+    from PIL import Image
+
+    # transparent pixels are composited onto the savefig facecolor
+    fig = plt.figure(figsize=(1, 1), facecolor="none")
+    with mpl.rc_context({"savefig.facecolor": "blue"}):
+        jpg = nwd.main.render_bytes(fig, ["jpg"])["jpg"]
+    plt.close(fig)
+    red, green, blue = Image.open(BytesIO(jpg)).getpixel((0, 0))
+    assert blue > 240 and red < 15 and green < 15
+
+
+def test_dashboard_alldata():
+    from src.main import load_ledger, prepare_config
+
+    full = nwd.Config(**std, csv="nwd_example.csv")
+    prepare_config(full)
+    alldata = load_ledger(full)
+
+    # the header and first year come with the ledger
+    cfg = nwd.Config(**std, csv="nwd_example.csv", layout="income4", headless=True)
+    assert list(nwd.dashboard(cfg, alldata)) == ["income4"]
+    assert cfg.income_cols == full.income_cols
+    assert cfg.since_yr == full.since_yr == 2022
+
+
+def test_reuse_figures():
+    def render(csv, reuse):
+        cfg = nwd.Config(**std, csv=csv, layout=["main7", "income4"], headless=True, reuse_figures=reuse)
+        figs = nwd.dashboard(cfg)
+        return figs, {name: nwd.main.render_bytes(fig)["png"] for name, fig in figs.items()}
+
+    first, _ = render("nwd_example_nocash.csv", True)
+    again, reused = render("nwd_example.csv", True)
+    assert again["main7"] is first["main7"]
+    _, fresh = render("nwd_example.csv", False)
+    assert reused == fresh
+
+
+def test_watch_update(tmp_path):
+    from src.watch import Watcher
+
+    csv = tmp_path / "ledger.csv"
+    csv.write_text(Path("tests/nwd_example.csv").read_text().rstrip("\n") + "\n")
+    cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/"}, csv="ledger.csv", layout=["income4", "cash4"], headless=True)
+    watcher = Watcher(cfg)
+    assert list(watcher.update()) == ["income4", "cash4"]
+    assert watcher.update() == {}
+
+    # edit an income cell: only the income layout is rendered again
+    csv.write_text(csv.read_text().replace("8500,,110\n", "8500,,120\n"))
+    assert list(watcher.update()) == ["income4"]
+
+    rows = len(watcher.alldata)
+    with open(csv, "a") as f:
+        f.write("2025-01-01,126000,103000,26000,133000,3250,8500,,110\n")
+    assert list(watcher.update()) == ["income4", "cash4"]
+    assert len(watcher.alldata) == rows + 1
+
+
+def test_watch_share_focus(tmp_path):
+    from benchmarks.ledger import SHARE_FOCUS, synthetic_ledger
+    from src.watch import Watcher
+
+    csv = tmp_path / "ledger.csv"
+    synthetic_ledger(csv, 200)
+    opts = std | {"csvdir": str(tmp_path) + "/", "share_focus": SHARE_FOCUS}
+    cfg = nwd.Config(**opts, csv="ledger.csv", layout=["cash4", "share4"], headless=True)
+    watcher = Watcher(cfg)
+    assert list(watcher.update()) == ["cash4", "share4"]
+
+    # edit only the fund of a purchase: share4 is rendered again
+    lines = csv.read_text().splitlines()
+    fund = lines[10].rsplit(",", 1)[1]
+    lines[10] = lines[10].rsplit(",", 1)[0] + "," + ("Shares2" if fund == "Shares1" else "Shares1")
+    csv.write_text("\n".join(lines) + "\n")
+    assert list(watcher.update()) == ["share4"]
+
+
+def test_binary_ledger_fund(tmp_path, monkeypatch):
+    from benchmarks.ledger import SHARE_FOCUS, synthetic_ledger
+    from src import binary
+    from src.main import convert_ledger, load_ledger, prepare_config
+
+    synthetic_ledger(tmp_path / "ledger.csv", 200)
+    opts = std | {"csvdir": str(tmp_path) + "/", "share_focus": SHARE_FOCUS, "headless": True}
+    dest = convert_ledger(nwd.Config(**opts, csv="ledger.csv"))
+    assert str(dest).endswith(".nwdl")
+
+    # the Fund column is stored, so share4 renders from the binary ledger
+    csv_cfg = nwd.Config(**opts, csv="ledger.csv")
+    prepare_config(csv_cfg)
+    expected = load_ledger(csv_cfg)
+    bin_cfg = nwd.Config(**opts, csv="ledger.nwdl")
+    prepare_config(bin_cfg)
+    mapped = load_ledger(bin_cfg)
+    fund_col = SHARE_FOCUS["expend_col"] + "_Fund"
+    assert (mapped[fund_col] == SHARE_FOCUS["fund"]).tolist() == (expected[fund_col] == SHARE_FOCUS["fund"]).tolist()
+    assert "share4" in nwd.dashboard(nwd.Config(**opts, csv="ledger.nwdl", layout="share4"))
+
+    # a .csv file is never opened to look for the binary format
+    def fail(path):
+        raise AssertionError(path)
+
+    monkeypatch.setattr(binary, "is_binary_ledger", fail)
+    load_ledger(csv_cfg)
+
+
+def test_import_time():
+    # Config, Colors and Strings must not pull in the plotting and dataframe stacks
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import src\n"
+        "src.Config(born_yr=1981, colors=src.Colors(), strings=src.Strings())\n"
+        "print(time.perf_counter() - start)\n"
+        "print(' '.join(mod for mod in ('matplotlib', 'pandas', 'numpy', 'ausankey') if mod in sys.modules))\n"
+        "print(src.main.__name__)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    seconds, heavy, main = out.split("\n")[:3]
+    assert heavy == ""
+    assert main == "src.main"  # loaded on first use
+    assert float(seconds) < 0.5
+
+
+def test_synthetic_ledger(tmp_path):
+    from benchmarks.bench_suite import run_case
+    from benchmarks.ledger import SHARE_FOCUS, synthetic_ledger
+
+    fname = tmp_path / "ledger.csv"
+    synthetic_ledger(fname, 500, expr_freq=0.5)
+    timings, errors = run_case(str(fname), layouts=False)
+    assert {"read_headers", "expr_columns", "dates_to_days", "sankey_shares"} <= set(timings)
+    assert errors == {}
+
+    cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/"}, csv="ledger.csv")
+    nwd.main.prepare_config(cfg)
+    alldata = nwd.main.build_ledger(cfg)
+    assert len(alldata) == 500
+    assert alldata["totalCash"].dtype.kind == "f"
+
+    # the "Fund" column matches the share focus used by the benchmarks
+    cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/"}, csv="ledger.csv", layout="share4", headless=True)
+    cfg.share_focus = SHARE_FOCUS
+    assert "share4" in nwd.dashboard(cfg)
+
+    # also when the ledger is read in chunks
+    cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/"}, csv="ledger.csv", layout="share4", headless=True, chunksize=100)
+    cfg.share_focus = SHARE_FOCUS
+    assert "share4" in nwd.dashboard(cfg)
+
+
+def test_timing_report():
+    cfg = nwd.Config(**std, csv="nwd_example.csv", layout="cash4", headless=True, timing=True, profile=True)
+    nwd.dashboard(cfg)
+    names = [span["name"] for span in cfg.timing_report["spans"]]
+    assert names[:2] == ["prepare", "ingest"]
+    assert "ingest/expressions" in names
+    assert "cash4/create/panel_cash_breakdown" in names
+    assert "cash4/save" in names
+    assert "create_dashboard_cash4" in cfg.timing_report["profile"]
+
+
+def test_typed_ledger():
+    from src.main import build_ledger, prepare_config, select_rows
+
+    cfg = nwd.Config(**std, csv="nwd_example.csv")
+    prepare_config(cfg)
+    alldata = build_ledger(cfg)
+    assert alldata["Year"].dtype == "int16"
+    assert alldata[cfg.cash_cols + cfg.shares_cols].dtypes.eq("float32").all()
+    assert alldata["total"].dtype == "float64"
+    assert not any(col.endswith("_price") for col in alldata.columns)
+
+    assert select_rows(alldata, alldata.total > 0) is alldata
+    some = select_rows(alldata, alldata.Year > alldata.Year.min())
+    assert some.index.equals(pd.RangeIndex(len(some)))
+
+
+def test_window_view():
+    from src.main import WindowView, window_view
+
+    data = pd.DataFrame({"Days": [0.0, 0.5, 1.0, 1.5, 2.0], "total": [1.0, -1.0, 3.0, 4.0, 5.0]})
+    view = WindowView(data, data.Days > 0.75)
+    assert list(view.window("Days")) == [1.0, 1.5, 2.0]
+    assert view.window("total") is view.window("total")
+    days, vals = view.positive("total")
+    assert list(days) == [0.0, 1.0, 1.5]
+    assert list(vals) == [1.0, 3.0, 4.0]
+    assert window_view(view, data, None) is view
+    assert window_view(view, data.copy(), data.Days > 0.75) is not view
+
+
+def test_fit_line():
+    import numpy as np
+
+    from src.main import WindowView, fit_line
+
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 3, 20))
+    y = 1000 * np.exp(0.3 * x) * rng.normal(1, 0.05, 20)
+    assert np.allclose(fit_line(x, y), np.polyfit(x, y, 1))
+    assert np.allclose(fit_line(x, np.log(y), y), np.polyfit(x, np.log(y), 1, w=np.sqrt(y)))
+
+    view = WindowView(pd.DataFrame({"Days": x, "total": y}), x > 1)
+    assert view.linear_fit("total") is view.linear_fit("total")
+    slope, intercept = view.linear_fit("total")
+    targets = [2000, 3000, 5000]
+    assert np.allclose(view.crossing_times("total", targets) * slope + intercept, targets)
+
+
+def test_target_projection():
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    from src.main import panel_all_vs_time
+
+    cfg = nwd.Config(**std, csv="nwd_example.csv", headless=True)
+    nwd.dashboard(cfg)
+    assert not hasattr(cfg, "target_years")
+
+    fig, ax = plt.subplots()
+    table = panel_all_vs_time(cfg, ax, cfg.window.data)
+    assert len(table) == len(cfg.linear_targets)
+    assert (table.years[table.shown] > 0).all()
+    guides = [coll for coll in ax.collections if isinstance(coll, LineCollection)]
+    assert sum(len(coll.get_segments()) for coll in guides) == table.shown.sum() > 0
+    assert sum(text.get_text().endswith(" yrs") for text in ax.texts) == table.shown.sum()
+    plt.close(fig)
+
+
+def test_dollar_formatter():
+    import matplotlib.pyplot as plt
+
+    from src.main import DollarFormatter, dollars_array, int_to_dollars
+
+    cfg = nwd.Config(**std)
+    vals = [0, 5, -999.4, 999.5, 1049, 9999.6, 12345, -999999, 1234567, 1.5e7, 2.5e9, -3e10]
+    assert dollars_array(cfg, vals) == [int_to_dollars(cfg, val) for val in vals]
+    assert dollars_array(cfg, vals, plussig=1) == [int_to_dollars(cfg, val, 1) for val in vals]
+
+    fmt = DollarFormatter(cfg)
+    assert fmt.format_ticks([120000, 125000, 130000]) == ["$120k", "$125k", "$130k"]
+    ticks = [-1500.7, 999.9, 122500, 127500.5, 2.5e6]
+    assert fmt.format_ticks(ticks) == [fmt(tick) for tick in ticks]
+    assert [fmt(tick) for tick in ticks] == [int_to_dollars(cfg, int(tick)) for tick in ticks]
+
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 3000])
+    nwd.main.yticks_dollars(cfg, ax)
+    ax.set_ylim(0, 6000)  # ticks follow the new limits
+    fig.canvas.draw()
+    assert ax.get_yticks()[-1] == 6000
+    assert ax.get_yticklabels()[-1].get_text() == "$6.0k"
+    plt.close(fig)
+
+
+def test_timeline_artists():
+    import matplotlib.pyplot as plt
+
+    from src.main import panel_timeline
+
+    cfg = nwd.Config(**std)
+    fig, ax = plt.subplots()
+    panel_timeline(cfg, ax)
+    # the line and a single collection of dots, rather than one artist per dot
+    assert len(ax.lines) + len(ax.collections) <= 2
+    (dots,) = ax.collections
+    assert len(dots.get_offsets()) == 27
+    plt.close(fig)
+
+
+def test_timeline_colors():
+    import matplotlib.colors as mcolors
+    import matplotlib.pyplot as plt
+
+    from src.main import panel_timeline
+
+    # color names of different lengths must not be truncated
+    cfg = nwd.Config(**std, colors=nwd.Colors(bg="black", frame="gray", total="tab:blue"))
+    fig, ax = plt.subplots()
+    panel_timeline(cfg, ax)
+    facecols = ax.collections[0].get_facecolors()
+    assert tuple(facecols[-1]) == mcolors.to_rgba("tab:blue")
+    assert {tuple(col) for col in facecols[:-1]} <= {mcolors.to_rgba("black"), mcolors.to_rgba("gray")}
+    plt.close(fig)
+
+
+
+def test_decimate():
+    import matplotlib.pyplot as plt
+
+    from src.main import decimate_indices, plot_dots, prepare_config
+
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.uniform(0, 30, 50_000))
+    y = np.cumsum(rng.normal(0, 1, len(x)))
+    y[100] = np.nan
+
+    ind = decimate_indices(x, y, 200)
+    assert len(ind) <= 402
+    assert np.all(np.diff(ind) > 0)
+    assert 100 not in ind
+    assert {0, len(x) - 1, np.nanargmin(y), np.nanargmax(y)} <= set(ind)
+    ind = decimate_indices(x, y, 200, "lttb")
+    assert len(ind) == 400
+    assert {0, len(x) - 1} <= set(ind)
+    assert len(decimate_indices(x[200:500], y[200:500], 200)) == 300
+    with pytest.raises(ValueError, match="decimation"):
+        decimate_indices(x, y, 200, "every10")
+
+    cfg = nwd.Config(**std, decimate="minmax", rasterize_dots=5000)
+    prepare_config(cfg)
+    fig, ax = plt.subplots()
+    (line,) = plot_dots(cfg, ax, x, y)
+    assert len(line.get_xdata()) <= 2 * ax.get_window_extent().width + 2
+    assert not line.get_rasterized()
+    cfg.decimate = None
+    (line,) = plot_dots(cfg, ax, x, y)
+    assert len(line.get_xdata()) == len(x)
+    assert line.get_rasterized()
+    cfg.rasterize_dots = None  # the default
+    (line,) = plot_dots(cfg, ax, x, y)
+    assert not line.get_rasterized()
+    plt.close(fig)
+
+
+def test_stream_ledger(tmp_path):
+    from src.main import build_ledger, prepare_config
+
+    # rows in reverse date order, so that the first chunks start after the earliest year
+    lines = Path(std["csvdir"], "nwd_example.csv").read_text().splitlines()
+    (tmp_path / "reversed.csv").write_text("\n".join(lines[:2] + lines[:1:-1]) + "\n")
+
+    for csvdir, csv in [(std["csvdir"], "nwd_example.csv"), (str(tmp_path) + "/", "reversed.csv")]:
+        full = nwd.Config(**std | {"csvdir": csvdir, "csv": csv})
+        prepare_config(full)
+        expected = build_ledger(full)
+
+        cfg = nwd.Config(**std | {"csvdir": csvdir, "csv": csv, "chunksize": 5})
+        prepare_config(cfg)
+        streamed = build_ledger(cfg)
+        assert cfg.since_yr == full.since_yr
+        pd.testing.assert_frame_equal(streamed, expected[streamed.columns], check_dtype=False)
+
+
+def test_binary_ledger(tmp_path):
+    from src.binary import read_binary_ledger
+    from src.main import convert_ledger, load_ledger, prepare_config
+
+    dest = convert_ledger(nwd.Config(**std, csv="nwd_example.csv"), tmp_path / "ledger.nwdl")
+
+    full = nwd.Config(**std, csv="nwd_example.csv")
+    prepare_config(full)
+    expected = load_ledger(full)
+
+    cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/", "csv": "ledger.nwdl", "cache": True})
+    prepare_config(cfg)
+    mapped = load_ledger(cfg)
+    assert cfg.since_yr == full.since_yr
+    assert cfg.income_cols == full.income_cols
+    assert isinstance(mapped["Cash_DayToDay"].values, np.memmap)
+    meta, columns = read_binary_ledger(dest)
+    assert meta["hdrrows"] == [list(row) for row in full.hdrrows]
+    assert {str(vals.dtype) for vals in columns.values()} == {"datetime64[ns]", "float64", "int32"}
+    assert mapped["Date"].dtype == "datetime64[ns]"
+    mapped = pd.DataFrame({col: np.array(mapped[col]) for col in mapped})
+    pd.testing.assert_frame_equal(mapped, expected[mapped.columns], check_dtype=False)
+
+    cfg = nwd.Config(**std | {"csvdir": str(tmp_path) + "/", "csv": "ledger.nwdl", "headless": True, "savepdf": False})
+    assert "main7" in nwd.dashboard(cfg)